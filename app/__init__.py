@@ -1,46 +1,106 @@
 import logging
 from flask import Flask, request, Response, jsonify
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-from .extensions import db, migrate, ma, REQUEST_COUNT, REQUEST_LATENCY, get_prometheus_registry
+from .extensions import db, db_breaker, init_migrations, REQUEST_COUNT, REQUEST_LATENCY, get_prometheus_registry
 from .logging_config import setup_logging
+from .tracing import RequestIdFilter, register_tracing
 from .errors import register_error_handlers
+from .utils.db_helpers import register_read_commits, register_statement_timeouts
+from .profiling import register_profiler
+from .slo import register_slo_metrics
+from .memory import register_memory_diagnostics
+from .db_instrumentation import register_query_instrumentation
+from .compression import register_compression
+from .http_cache import register_cache_headers
+from .health import register_health_checks, PROBE_PATHS
+from .lifecycle import lifecycle
+from .rate_limit import register_rate_limiting
+from .idempotency import register_idempotency
+from .commands import register_commands
 from .routes import student_bp
 from config import config
 import os
 import time
 
 
-def create_app(config_name=None):
+def create_app(config_name=None, test_config=None):
     setup_logging()
     app = Flask(__name__)
     # If running under Gunicorn, use its handlers
     gunicorn_logger = logging.getLogger('gunicorn.error')
     if gunicorn_logger.handlers:
         app.logger.handlers = gunicorn_logger.handlers
+        for handler in app.logger.handlers:
+            handler.addFilter(RequestIdFilter())
         app.logger.setLevel(gunicorn_logger.level)
     # Determine environment
     if not config_name:
         config_name = os.environ.get("FLASK_ENV", "default")
     app.config.from_object(config[config_name])
+    if test_config:
+        app.config.update(test_config)
     
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
-    ma.init_app(app)
+    # Serving workers never run migrations: only load alembic for the flask CLI
+    if os.environ.get("FLASK_RUN_FROM_CLI") == "true" or app.config.get("MIGRATIONS_ENABLED"):
+        init_migrations(app)
+    db_breaker.init_app(app)
+    register_statement_timeouts()
+    # psycopg keeps prepared statements across requests only if reads don't end in ROLLBACK
+    register_read_commits(app)
 
     # Import models so Alembic sees them
     from app.models.student import Student
+    from app.models.idempotency import IdempotencyKey
+    from app.models.outbox import OutboxEvent
+
+    # X-Request-ID on every request/log line, spans when TRACING_ENABLED (runs before other hooks)
+    register_tracing(app)
 
     # Register blueprints
     app.register_blueprint(student_bp)
+
+    # flask CLI commands (outbox dispatcher, ...)
+    register_commands(app)
     
     @app.route("/healthcheck", methods=["GET"])
     def health_check_global():
         return jsonify({"status": "ok"}), 200
 
+    # Liveness + cached DB readiness
+    register_health_checks(app)
+
+    # Connection: close while draining for graceful shutdown (see gunicorn.conf.py)
+    lifecycle.init_app(app)
+
     # Register error handlers
     register_error_handlers(app)
 
+    # Opt-in sampling profiler (no hooks at all when disabled)
+    register_profiler(app)
+
+    # Latency histograms per route class + SLO error-budget counters
+    register_slo_metrics(app)
+
+    # Per-worker RSS gauge + tracemalloc diffs on /debug/memory
+    register_memory_diagnostics(app)
+
+    # Query count / DB time per request + slow query log
+    register_query_instrumentation(app)
+
+    # gzip / br / zstd negotiated from Accept-Encoding
+    register_compression(app)
+
+    # Cache-Control/Vary for reads, no-store for writes
+    register_cache_headers(app)
+
+    # Per-client token buckets, rejects before an Idempotency-Key is taken
+    register_rate_limiting(app)
+
+    # Idempotency-Key replay for POST/PUT/PATCH (runs before compression on the way out)
+    register_idempotency(app)
+
     # if config_name == "development":
     #     with app.app_context():
     #         db.create_all()
@@ -51,7 +111,7 @@ def create_app(config_name=None):
     
     @app.before_request
     def suppress_log_for_probes():
-        if request.path in ["/metrics", "/healthcheck"]:
+        if request.path in PROBE_PATHS:
             logging.getLogger("werkzeug").disabled = True
 
         if request.path != "/metrics":
@@ -63,11 +123,12 @@ def create_app(config_name=None):
         logging.getLogger("werkzeug").disabled = False
 
         # Skip for health + metrics
-        if request.path in ["/metrics", "/healthcheck"]:
+        if request.path in PROBE_PATHS:
             return response
 
         method = request.method
-        endpoint = request.path
+        # Route template, not the raw path: one label set per route instead of per student id
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
         status = response.status_code
 
         REQUEST_COUNT.labels(
@@ -0,0 +1,131 @@
+import logging
+import os
+import signal
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.extensions import db
+from app.services import archive_service, outbox_service, seed_service
+from app.utils.data_generator import generate_students
+from app.utils.event_sinks import build_sink
+
+outbox_cli = AppGroup("outbox", help="Transactional outbox for student change events.")
+students_cli = AppGroup("students", help="Student data utilities.")
+
+logger = logging.getLogger(__name__)
+
+
+@outbox_cli.command("dispatch")
+@click.option("--sink", default=None, help="stdout, file:/path.jsonl or an http(s) webhook URL.")
+@click.option("--batch-size", type=int, default=None, help="Events per batch.")
+@click.option("--interval", type=float, default=None, help="Seconds to sleep when there is nothing to send.")
+@click.option("--once", is_flag=True, help="Drain pending events and exit.")
+@click.option("--metrics-port", type=int, default=None, help="Expose Prometheus metrics on this port.")
+def dispatch_command(sink, batch_size, interval, once, metrics_port):
+    """Push pending outbox events to the sink (at-least-once)."""
+    config = current_app.config
+    sink = build_sink(sink or config["OUTBOX_SINK"], timeout=config["OUTBOX_WEBHOOK_TIMEOUT"])
+    batch_size = batch_size or config["OUTBOX_BATCH_SIZE"]
+    interval = interval if interval is not None else config["OUTBOX_POLL_INTERVAL"]
+
+    if metrics_port:
+        from prometheus_client import start_http_server, REGISTRY
+        from app.extensions import get_prometheus_registry
+        registry = get_prometheus_registry() if "PROMETHEUS_MULTIPROC_DIR" in os.environ else REGISTRY
+        start_http_server(metrics_port, registry=registry)
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    pending, lag = 0, 0.0
+
+    while not stopping:
+        try:
+            sent = outbox_service.dispatch_batch(sink, batch_size)
+            pending, lag = outbox_service.update_lag_metrics()
+        except Exception:
+            # A DB blip or statement timeout must not end a long-running dispatcher
+            logger.exception("Outbox dispatch failed, retrying")
+            db.session.rollback()
+            if once:
+                raise
+            time.sleep(interval)
+            continue
+        if sent:
+            continue
+        if once:
+            break
+        time.sleep(interval)
+    click.echo(f"Outbox dispatcher stopped, {pending} events pending (lag {lag:.1f}s)")
+
+
+@outbox_cli.command("purge")
+@click.option("--older-than-hours", type=float, default=168, show_default=True)
+def purge_command(older_than_hours):
+    """Delete delivered events older than the given age."""
+    removed = outbox_service.purge_dispatched(older_than_hours)
+    click.echo(f"Purged {removed} delivered outbox events")
+
+
+@students_cli.command("seed")
+@click.option("--count", type=int, default=1000, show_default=True, help="Students to generate.")
+@click.option("--seed", type=int, default=42, show_default=True, help="Random seed, same seed gives the same rows.")
+@click.option("--start", type=int, default=0, show_default=True, help="First row index, use to append to a seeded table.")
+@click.option("--batch-size", type=int, default=10000, show_default=True, help="Rows per INSERT/COPY and commit.")
+@click.option("--now", type=click.DateTime(), default=None,
+              help="created_at is spread over the 3 years before this (default 2026-01-01, fixed for repeatability).")
+def seed_command(count, seed, start, batch_size, now):
+    """Bulk-load deterministic synthetic students for capacity testing."""
+    started = time.perf_counter()
+    report_every = max(batch_size, count // 20)
+
+    def progress(loaded):
+        if loaded % report_every < batch_size or loaded == count:
+            click.echo(f"  {loaded}/{count} students")
+
+    loaded = seed_service.bulk_load_students(
+        generate_students(count, seed=seed, start=start, now=now), batch_size=batch_size, progress=progress
+    )
+    elapsed = time.perf_counter() - started
+    click.echo(f"Seeded {loaded} students in {elapsed:.1f}s ({loaded / max(elapsed, 1e-9):.0f} rows/s)")
+
+
+@students_cli.command("archive")
+@click.option("--older-than-days", type=float, default=None, help="Archive students not updated for this many days.")
+@click.option("--batch-size", type=int, default=None, help="Rows moved per transaction.")
+@click.option("--pause", type=float, default=None, help="Seconds to sleep between batches.")
+@click.option("--max-batches", type=int, default=None, help="Stop after this many batches (off-peak windows).")
+def archive_command(older_than_days, batch_size, pause, max_batches):
+    """Move inactive students to students_archive in small transactions."""
+    config = current_app.config
+    moved = archive_service.archive_inactive_students(
+        older_than_days if older_than_days is not None else config["STUDENT_ARCHIVE_AFTER_DAYS"],
+        batch_size=batch_size or config["STUDENT_ARCHIVE_BATCH_SIZE"],
+        pause=pause if pause is not None else config["STUDENT_ARCHIVE_PAUSE"],
+        max_batches=max_batches,
+        progress=lambda moved: click.echo(f"  {moved} students archived"),
+    )
+    click.echo(f"Archived {moved} students")
+
+
+@students_cli.command("purge")
+@click.option("--older-than-hours", type=float, default=None, help="Purge students deleted longer ago than this.")
+@click.option("--batch-size", type=int, default=None, help="Rows deleted per transaction.")
+@click.option("--pause", type=float, default=None, help="Seconds to sleep between batches.")
+@click.option("--max-batches", type=int, default=None, help="Stop after this many batches (off-peak windows).")
+def purge_students_command(older_than_hours, batch_size, pause, max_batches):
+    """Physically delete soft-deleted students in small transactions."""
+    config = current_app.config
+    removed = archive_service.purge_deleted_students(
+        older_than_hours if older_than_hours is not None else config["STUDENT_PURGE_AFTER_HOURS"],
+        batch_size=batch_size or config["STUDENT_PURGE_BATCH_SIZE"],
+        pause=pause if pause is not None else config["STUDENT_ARCHIVE_PAUSE"],
+        max_batches=max_batches,
+        progress=lambda removed: click.echo(f"  {removed} students purged"),
+    )
+    click.echo(f"Purged {removed} deleted students")
+
+
+def register_commands(app):
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(students_cli)
@@ -0,0 +1,168 @@
+import logging
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/html",
+    "text/plain",
+}
+
+
+class _GzipStream:
+    def __init__(self, level):
+        # wbits=31 -> gzip container
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._obj.process(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+def available_encodings(preference):
+    """Encodings from the configured preference list that can actually be produced here."""
+    installed = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    return [enc for enc in preference if installed.get(enc)]
+
+
+def parse_accept_encoding(header):
+    """Return {encoding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for item in (header or "").split(","):
+        parts = [p.strip() for p in item.split(";")]
+        name = parts[0].lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def choose_encoding(header, available):
+    """Pick the client's highest-q encoding, ties broken by server preference order."""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for enc in available:
+        q = accepted.get(enc, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def _make_stream(encoding, config):
+    if encoding == "br":
+        return _BrotliStream(config.get("COMPRESS_BR_QUALITY", 4))
+    if encoding == "zstd":
+        return _ZstdStream(config.get("COMPRESS_ZSTD_LEVEL", 3))
+    return _GzipStream(config.get("COMPRESS_LEVEL", 1))
+
+
+def compress_bytes(data, encoding, config):
+    stream = _make_stream(encoding, config)
+    return stream.compress(data) + stream.finish()
+
+
+def _compress_chunks(chunks, encoding, config):
+    # Flush after every chunk so exports reach the client as they are produced
+    stream = _make_stream(encoding, config)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        out = stream.compress(chunk) + stream.flush()
+        if out:
+            yield out
+    yield stream.finish()
+
+
+def register_compression(app):
+    """Compress eligible responses according to Accept-Encoding."""
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return
+
+    preference = [e.strip() for e in app.config.get("COMPRESS_ALGORITHMS", "zstd,br,gzip").split(",") if e.strip()]
+    encodings = available_encodings(preference)
+    min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+    logger.info(f"Response compression enabled: {encodings}")
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            request.method == "HEAD"
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or "Content-Encoding" in response.headers
+            or response.direct_passthrough
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"), encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_chunks(response.response, encoding, app.config)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            # Small bodies (single student, errors) cost more CPU than they save
+            if len(data) < min_size:
+                return response
+            response.set_data(compress_bytes(data, encoding, app.config))
+
+        response.headers["Content-Encoding"] = encoding
+        return response
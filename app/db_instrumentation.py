@@ -0,0 +1,122 @@
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from app.extensions import DB_COMPILED_CACHE, DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST
+from app.health import PROBE_PATHS
+
+logger = logging.getLogger("app.sql")
+
+_local = threading.local()
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+# BEGIN/SAVEPOINT/... reach the cursor on some drivers only, the per-route SET LOCAL on Postgres only:
+# counting them would make budgets driver-dependent (their time still counts, a slow COMMIT is real)
+_TRANSACTION_CONTROL = re.compile(r"\s*(?:BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|SET LOCAL)\b", re.IGNORECASE)
+
+_CACHE_RESULTS = {stat: stat.name.lower().removeprefix("cache_") for stat in CacheStats}
+
+
+def normalize_sql(statement):
+    """Collapse whitespace and strip literals so identical queries group together in logs."""
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _IN_LIST.sub("(...)", sql)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    counted = not _TRANSACTION_CONTROL.match(statement)
+
+    if counted:
+        for statements in getattr(_local, "counters", ()):
+            statements.append(statement)
+        if context is not None:
+            DB_COMPILED_CACHE.labels(result=_CACHE_RESULTS.get(context.cache_hit, "unknown")).inc()
+
+    if has_request_context():
+        g._db_queries = g.get("_db_queries", 0) + int(counted)
+        g._db_time = g.get("_db_time", 0.0) + elapsed
+
+    if has_app_context():
+        threshold_ms = current_app.config.get("SQL_SLOW_QUERY_MS")
+        if threshold_ms is not None and elapsed * 1000 >= threshold_ms:
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {normalize_sql(statement)}")
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def install_listeners():
+    """Attach the engine listeners once per process."""
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement executed by this thread inside the block."""
+    install_listeners()
+    statements = []
+    counters = getattr(_local, "counters", None)
+    if counters is None:
+        counters = _local.counters = []
+    counters.append(statements)
+    try:
+        yield statements
+    finally:
+        counters.remove(statements)
+
+
+def register_query_instrumentation(app):
+    """Per-request query count / DB time histograms and Server-Timing header."""
+    if not app.config.get("SQL_INSTRUMENTATION_ENABLED", True):
+        return
+    install_listeners()
+
+    @app.before_request
+    def start_db_timer():
+        g._db_queries = 0
+        g._db_time = 0.0
+        g._request_started = time.perf_counter()
+
+    @app.after_request
+    def record_db_metrics(response):
+        if request.path in PROBE_PATHS:
+            return response
+
+        queries = g.get("_db_queries", 0)
+        db_time = g.get("_db_time", 0.0)
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+
+        DB_QUERIES_PER_REQUEST.labels(route=route).observe(queries)
+        DB_TIME_PER_REQUEST.labels(route=route).observe(db_time)
+
+        if app.config.get("SERVER_TIMING_ENABLED", True):
+            timings = [f'db;dur={db_time * 1000:.2f};desc="{queries} queries"']
+            if "_request_started" in g:
+                total = time.perf_counter() - g._request_started
+                timings.append(f"app;dur={total * 1000:.2f}")
+            response.headers.add("Server-Timing", ", ".join(timings))
+        return response
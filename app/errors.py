@@ -3,7 +3,7 @@ from flask import jsonify
 from marshmallow import ValidationError
 from app.utils.error_helpers import format_error_response
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from app.utils.custom_errors import DuplicateError, NotFoundError
+from app.utils.custom_errors import DuplicateError, NotFoundError, ServiceUnavailableError
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +29,14 @@ def register_error_handlers(app):
         logger.info(str(err))
         return jsonify(format_error_response(str(err))), 404
     
+    @app.errorhandler(ServiceUnavailableError)
+    def handle_service_unavailable(err):
+        logger.warning(str(err))
+        response = jsonify(format_error_response(str(err)))
+        if err.retry_after is not None:
+            response.headers["Retry-After"] = str(err.retry_after)
+        return response, 503
+
     @app.errorhandler(IntegrityError)
     def handle_integrity_error(err):
         logger.error("Database integrity error", exc_info=True)
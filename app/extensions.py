@@ -1,11 +1,41 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_marshmallow import Marshmallow
-from prometheus_client import Counter, Histogram, CollectorRegistry, multiprocess
+from flask_sqlalchemy.session import Session
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, multiprocess
+from app.utils.circuit_breaker import CircuitBreaker
 import os
-ma = Marshmallow()
-db = SQLAlchemy()
-migrate = Migrate()
+
+
+class BindableSession(Session):
+    """Flask-SQLAlchemy's session, except a bind set via db.session.configure() wins over the engines."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.bind is not None:
+            return self.bind
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": BindableSession})
+
+
+# Flask-Migrate (alembic) and flask-marshmallow (marshmallow-sqlalchemy) are
+# loaded on first use so serving workers don't pay for them at boot
+def init_migrations(app):
+    """Register Flask-Migrate and the `flask db` commands."""
+    from flask_migrate import Migrate
+    return Migrate(app, db)
+
+
+def __getattr__(name):
+    if name == "ma":
+        from flask_marshmallow import Marshmallow
+        marshmallow = Marshmallow()
+        # Same session binding ma.init_app() does for Flask-SQLAlchemy
+        marshmallow.SQLAlchemySchema.OPTIONS_CLASS.session = db.session
+        marshmallow.SQLAlchemyAutoSchema.OPTIONS_CLASS.session = db.session
+        globals()["ma"] = marshmallow
+        return marshmallow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Prometheus RED metrics Using 0.5 in aws
 REQUEST_COUNT = Counter(
@@ -21,6 +51,146 @@ REQUEST_LATENCY = Histogram(
     buckets=[0.1, 0.3, 0.5, 1, 2, 5]
 )
 
+# Per-request DB usage, labelled by route template (not raw path)
+DB_QUERIES_PER_REQUEST = Histogram(
+    'http_request_db_queries',
+    'SQL statements executed per request',
+    ['route'],
+    buckets=[0, 1, 2, 3, 4, 5, 10, 20, 50]
+)
+
+DB_TIME_PER_REQUEST = Histogram(
+    'http_request_db_duration_seconds',
+    'Time spent executing SQL per request',
+    ['route'],
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5]
+)
+
+# SQLAlchemy compiled-statement cache, misses after warm-up mean DB_QUERY_CACHE_SIZE is too small
+DB_COMPILED_CACHE = Counter(
+    'db_compiled_cache_total',
+    'SQL statements by compiled cache result (hit, miss, no_cache_key, caching_disabled)',
+    ['result']
+)
+
+# DB circuit breaker: 0=closed, 1=half-open, 2=open (worst worker wins)
+DB_CIRCUIT_STATE = Gauge(
+    'db_circuit_breaker_state',
+    'Database circuit breaker state (0=closed, 1=half-open, 2=open)',
+    ['breaker'],
+    multiprocess_mode='livemax'
+)
+
+DB_CIRCUIT_REJECTIONS = Counter(
+    'db_circuit_breaker_rejections_total',
+    'Calls rejected while the database circuit breaker was open',
+    ['breaker']
+)
+
+IDEMPOTENCY_REQUESTS = Counter(
+    'idempotency_requests_total',
+    'Write requests carrying an Idempotency-Key, by outcome',
+    ['outcome']
+)
+
+# Transactional outbox (exported by the `flask outbox dispatch` process)
+OUTBOX_PENDING = Gauge(
+    'outbox_pending_events',
+    'Outbox events not yet delivered',
+    multiprocess_mode='livemax'
+)
+
+OUTBOX_LAG_SECONDS = Gauge(
+    'outbox_lag_seconds',
+    'Age of the oldest undelivered outbox event',
+    multiprocess_mode='livemax'
+)
+
+OUTBOX_DISPATCHED = Counter(
+    'outbox_dispatched_events_total',
+    'Outbox events delivered to the sink'
+)
+
+OUTBOX_DISPATCH_FAILURES = Counter(
+    'outbox_dispatch_failures_total',
+    'Outbox batches the sink rejected'
+)
+
+# Latency SLOs per route class (histograms per class are built in app/slo.py)
+SLO_REQUESTS = Counter(
+    'slo_requests_total',
+    'Requests evaluated against their route class SLO',
+    ['route', 'slo_class']
+)
+
+SLO_BUDGET_BURN = Counter(
+    'slo_error_budget_burn_total',
+    'Requests that consumed error budget (reason=latency|error)',
+    ['route', 'slo_class', 'reason']
+)
+
+SLO_OBJECTIVE = Gauge(
+    'slo_objective_ratio',
+    'Target ratio of good requests per SLO class',
+    ['slo_class'],
+    multiprocess_mode='livemax'
+)
+
+SLO_LATENCY_TARGET = Gauge(
+    'slo_latency_target_seconds',
+    'Latency threshold of a good request per SLO class',
+    ['slo_class'],
+    multiprocess_mode='livemax'
+)
+
+# Spans the batch exporter lost (reason=queue_full|export_error)
+TRACING_SPANS_DROPPED = Counter(
+    'tracing_spans_dropped_total',
+    'Finished spans that were never exported',
+    ['reason']
+)
+
+# Log records dropped by the sampling filter (reason=sampled|rate_limited|duplicate)
+LOG_RECORDS_DROPPED = Counter(
+    'log_records_dropped_total',
+    'Log records dropped before formatting',
+    ['logger', 'level', 'reason']
+)
+
+# Token-bucket rate limiting (route = endpoint with its own limit, or "default")
+RATE_LIMITED_REQUESTS = Counter(
+    'rate_limited_requests_total',
+    'Requests rejected with 429 by the rate limiter',
+    ['route']
+)
+
+RATE_LIMIT_BACKEND_ERRORS = Counter(
+    'rate_limit_backend_errors_total',
+    'Rate limit checks skipped because the store failed (request allowed)'
+)
+
+# Worker memory: RSS per live worker (pid label in multiprocess mode) and RSS-triggered restarts
+WORKER_RSS = Gauge(
+    'worker_resident_memory_bytes',
+    'Resident set size of the worker process',
+    multiprocess_mode='liveall'
+)
+
+WORKER_RECYCLES = Counter(
+    'worker_recycles_total',
+    'Workers that asked Gunicorn to replace them',
+    ['reason']
+)
+
+# Cached readiness per worker (1=ready), any not-ready worker shows as 0
+READINESS = Gauge(
+    'app_readiness',
+    'Readiness of the worker as reported by /healthcheck/ready',
+    multiprocess_mode='livemin'
+)
+
+db_breaker = CircuitBreaker("database", state_gauge=DB_CIRCUIT_STATE, rejection_counter=DB_CIRCUIT_REJECTIONS)
+
 
 # Multiprocess registry (for Gunicorn) ---
 def get_prometheus_registry():
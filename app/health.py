@@ -0,0 +1,127 @@
+import logging
+import os
+import threading
+import time
+from flask import jsonify
+from sqlalchemy import text
+from app.extensions import db, READINESS
+
+logger = logging.getLogger(__name__)
+
+LIVENESS_PATH = "/healthcheck/live"
+READINESS_PATH = "/healthcheck/ready"
+
+# Probe/scrape paths: no access logs, no request metrics
+PROBE_PATHS = ("/metrics", "/healthcheck", LIVENESS_PATH, READINESS_PATH)
+
+
+def _pool_status(engine):
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    # Only QueuePool exposes sizing, SQLite test pools don't
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            status[name] = fn()
+    return status
+
+
+class ReadinessChecker:
+    """
+    Background-refreshed DB readiness.
+
+    One daemon thread per worker runs `SELECT 1` every `interval` seconds and
+    caches the result, so readiness probes only read a dict. A result older
+    than `max_age` counts as not ready (the checker itself is stuck).
+    """
+
+    def __init__(self):
+        self.interval = 5.0
+        self.max_age = 15.0
+        self.draining = False
+        self._app = None
+        self._result = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def init_app(self, app):
+        self._app = app
+        self.interval = app.config.get("HEALTH_CHECK_INTERVAL", 5.0)
+        self.max_age = app.config.get("HEALTH_CHECK_MAX_AGE", self.interval * 3)
+        self.draining = False
+        self._result = None
+
+    def check_now(self):
+        """Run the DB check and cache the result."""
+        started = time.perf_counter()
+        result = {"checked_at": time.time()}
+        try:
+            with self._app.app_context():
+                engine = db.engine
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                result["database"] = "ok"
+                result["pool"] = _pool_status(engine)
+        except Exception as err:
+            logger.warning(f"Readiness check failed: {err.__class__.__name__}")
+            result["database"] = "unavailable"
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        with self._lock:
+            self._result = result
+        return result
+
+    def _ensure_thread(self):
+        # One refresher per Gunicorn worker, started after fork
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="readiness-check", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.check_now()
+
+    def snapshot(self):
+        """Cached readiness, (ready, body). Never touches the DB except on the very first call."""
+        self._ensure_thread()
+        with self._lock:
+            result = self._result
+        if result is None:
+            result = self.check_now()
+
+        age = time.time() - result["checked_at"]
+        ready = result["database"] == "ok" and age <= self.max_age and not self.draining
+        body = {
+            "status": "ready" if ready else "not_ready",
+            "database": result["database"],
+            "checked_seconds_ago": round(age, 2),
+            "check_latency_ms": result["latency_ms"],
+            "draining": self.draining,
+        }
+        if "pool" in result:
+            body["pool"] = result["pool"]
+        READINESS.set(1 if ready else 0)
+        return ready, body
+
+
+readiness = ReadinessChecker()
+
+
+def register_health_checks(app):
+    readiness.init_app(app)
+
+    @app.route(LIVENESS_PATH, methods=["GET"])
+    def liveness():
+        # Process is up and serving, deliberately no dependency checks
+        return jsonify({"status": "ok"}), 200
+
+    @app.route(READINESS_PATH, methods=["GET"])
+    def readiness_check():
+        ready, body = readiness.snapshot()
+        return jsonify(body), 200 if ready else 503
@@ -0,0 +1,32 @@
+from flask import request
+
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+
+def register_cache_headers(app):
+    """Cache-Control/Vary for successful reads, no-store on writes so no cache ever keeps them."""
+    if not app.config.get("HTTP_CACHE_ENABLED", True):
+        return
+
+    policies = app.config.get("HTTP_CACHE_CONTROL", {})
+    write_policy = app.config.get("HTTP_CACHE_WRITE_CONTROL", "no-store")
+    vary = [v.strip() for v in app.config.get("HTTP_CACHE_VARY", "Accept-Encoding").split(",") if v.strip()]
+
+    @app.after_request
+    def add_cache_headers(response):
+        if "Cache-Control" in response.headers:
+            return response  # the route decided
+        if request.method in CACHEABLE_METHODS:
+            policy = policies.get(request.endpoint)
+            if policy is None:
+                return response
+            if response.status_code != 200:
+                # A cached 404/5xx would hide a fresh create or a recovery
+                response.headers["Cache-Control"] = "no-store"
+                return response
+            response.headers["Cache-Control"] = policy
+            for header in vary:
+                response.vary.add(header)
+        elif request.blueprint is not None and write_policy:
+            response.headers["Cache-Control"] = write_policy
+        return response
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+import click
+from flask import Response, current_app, g, jsonify, request
+from flask.cli import AppGroup
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db, db_breaker, IDEMPOTENCY_REQUESTS
+from app.models.idempotency import IdempotencyKey
+from app.rate_limit import client_key_func
+from app.utils.error_helpers import format_error_response
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+ACQUIRED = "acquired"
+REPLAY = "replay"
+IN_PROGRESS = "in_progress"
+MISMATCH = "mismatch"
+
+
+class DatabaseIdempotencyStore:
+    """
+    Stores first responses in the `idempotency_keys` table.
+
+    The row is inserted before the route runs, its primary key is the lock
+    for concurrent duplicates. Uses its own connections so it never mixes
+    with the service layer's session/transaction.
+    """
+
+    def __init__(self, ttl, lock_timeout):
+        self.ttl = timedelta(seconds=ttl)
+        self.lock_timeout = timedelta(seconds=lock_timeout)
+        self.table = IdempotencyKey.__table__
+
+    @db_breaker
+    def acquire(self, key, fingerprint):
+        now = datetime.utcnow()
+        values = {
+            "fingerprint": fingerprint,
+            "status_code": None,
+            "response_body": None,
+            "content_type": None,
+            "locked_until": now + self.lock_timeout,
+            "expires_at": now + self.ttl,
+            "created_at": now,
+        }
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(insert(self.table).values(key=key, **values))
+            return ACQUIRED, None
+        except IntegrityError:
+            pass
+
+        t = self.table
+        with db.engine.begin() as conn:
+            row = conn.execute(select(t).where(t.c.key == key)).mappings().first()
+            if row is None:
+                return IN_PROGRESS, None
+
+            stale = row["expires_at"] <= now or (row["status_code"] is None and row["locked_until"] <= now)
+            if stale:
+                # Expired record or a crashed first request: take the key over
+                taken = conn.execute(
+                    update(t)
+                    .where(t.c.key == key)
+                    .where(or_(t.c.expires_at <= now, and_(t.c.status_code.is_(None), t.c.locked_until <= now)))
+                    .values(**values)
+                ).rowcount
+                return (ACQUIRED, None) if taken else (IN_PROGRESS, None)
+
+        if row["status_code"] is None:
+            return IN_PROGRESS, None
+        if row["fingerprint"] != fingerprint:
+            return MISMATCH, None
+        return REPLAY, {
+            "status_code": row["status_code"],
+            "body": row["response_body"],
+            "content_type": row["content_type"],
+        }
+
+    def complete(self, key, status_code, body, content_type):
+        t = self.table
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(t).where(t.c.key == key).values(
+                    status_code=status_code, response_body=body, content_type=content_type
+                )
+            )
+
+    def release(self, key):
+        t = self.table
+        with db.engine.begin() as conn:
+            conn.execute(delete(t).where(t.c.key == key).where(t.c.status_code.is_(None)))
+
+    def purge_expired(self):
+        t = self.table
+        with db.engine.begin() as conn:
+            return conn.execute(delete(t).where(t.c.expires_at <= datetime.utcnow())).rowcount
+
+
+class RedisIdempotencyStore:
+    """
+    Same contract on top of any Redis-compatible client (redis-py, fakeredis,
+    KeyDB, Valkey...). SET NX is the in-flight lock, TTLs handle expiry.
+    """
+
+    def __init__(self, client, ttl, lock_timeout, prefix="idempotency:"):
+        self.client = client
+        self.ttl = int(ttl)
+        self.lock_timeout = int(lock_timeout)
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, ttl, lock_timeout):
+        import redis  # optional dependency, only needed for this backend
+        return cls(redis.Redis.from_url(url), ttl, lock_timeout)
+
+    def acquire(self, key, fingerprint):
+        name = self.prefix + key
+        lock = json.dumps({"fingerprint": fingerprint, "status_code": None})
+        if self.client.set(name, lock, nx=True, ex=self.lock_timeout):
+            return ACQUIRED, None
+
+        raw = self.client.get(name)
+        if raw is None:
+            # Expired between SET and GET
+            return (ACQUIRED, None) if self.client.set(name, lock, nx=True, ex=self.lock_timeout) else (IN_PROGRESS, None)
+
+        record = json.loads(raw)
+        if record["status_code"] is None:
+            return IN_PROGRESS, None
+        if record["fingerprint"] != fingerprint:
+            return MISMATCH, None
+        return REPLAY, record
+
+    def complete(self, key, status_code, body, content_type):
+        record = {
+            "fingerprint": json.loads(self.client.get(self.prefix + key) or "{}").get("fingerprint"),
+            "status_code": status_code,
+            "body": body,
+            "content_type": content_type,
+        }
+        self.client.set(self.prefix + key, json.dumps(record), ex=self.ttl)
+
+    def release(self, key):
+        self.client.delete(self.prefix + key)
+
+    def purge_expired(self):
+        return 0  # Redis expires keys itself
+
+
+def build_store(app):
+    ttl = app.config.get("IDEMPOTENCY_TTL", 86400)
+    lock_timeout = app.config.get("IDEMPOTENCY_LOCK_TIMEOUT", 30)
+    if app.config.get("IDEMPOTENCY_BACKEND", "database") == "redis":
+        return RedisIdempotencyStore.from_url(app.config["IDEMPOTENCY_REDIS_URL"], ttl, lock_timeout)
+    return DatabaseIdempotencyStore(ttl, lock_timeout)
+
+
+def store_key(client, endpoint, key):
+    """
+    Namespace the client's key by caller and route, so two clients (or two
+    routes) reusing the same UUID never see each other's responses.
+    """
+    return hashlib.sha256(f"{client}\n{endpoint}\n{key}".encode()).hexdigest()
+
+
+def _fingerprint():
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(b"\n" + request.path.encode() + b"\n")
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+idempotency_cli = AppGroup("idempotency", help="Idempotency-Key store maintenance.")
+
+
+@idempotency_cli.command("purge")
+def purge_command():
+    """Delete expired idempotency records."""
+    removed = current_app.extensions["idempotency"].purge_expired()
+    click.echo(f"Purged {removed} expired idempotency keys")
+
+
+def register_idempotency(app, store=None):
+    """Replay the stored response for retried write requests carrying an Idempotency-Key."""
+    if not app.config.get("IDEMPOTENCY_ENABLED", True):
+        return
+    store = store or build_store(app)
+    app.extensions["idempotency"] = store
+    methods = set(app.config.get("IDEMPOTENCY_METHODS", ("POST", "PUT", "PATCH")))
+    client_key = client_key_func(app)
+    app.cli.add_command(idempotency_cli)
+
+    @app.before_request
+    def check_idempotency_key():
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key or request.method not in methods or not request.path.startswith("/api/"):
+            return None
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify(format_error_response(f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters")), 400
+
+        namespaced = store_key(client_key(), request.endpoint, key)
+        state, record = store.acquire(namespaced, _fingerprint())
+        IDEMPOTENCY_REQUESTS.labels(outcome=state).inc()
+
+        if state == ACQUIRED:
+            g._idempotency_key = namespaced
+            return None
+        if state == REPLAY:
+            response = Response(record["body"], status=record["status_code"], content_type=record["content_type"])
+            response.headers[REPLAY_HEADER] = "true"
+            return response
+        if state == IN_PROGRESS:
+            logger.info(f"Idempotency key {key} already in progress")
+            response = jsonify(format_error_response("A request with this Idempotency-Key is already in progress"))
+            response.headers["Retry-After"] = "1"
+            return response, 409
+        return jsonify(format_error_response("Idempotency-Key was already used with a different request")), 422
+
+    @app.after_request
+    def store_idempotent_response(response):
+        key = g.get("_idempotency_key")
+        if key is None:
+            return response
+        # 5xx are not a final answer: let the client retry for real
+        if response.status_code >= 500 or response.is_streamed:
+            store.release(key)
+        else:
+            store.complete(key, response.status_code, response.get_data(as_text=True), response.content_type)
+        # Only now: if complete() failed, teardown still releases the key
+        g.pop("_idempotency_key", None)
+        return response
+
+    @app.teardown_request
+    def release_idempotency_key(exc):
+        key = g.pop("_idempotency_key", None)
+        if key is not None:
+            store.release(key)
@@ -0,0 +1,60 @@
+import logging
+from app.extensions import db
+from app.health import readiness
+from app.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """
+    Drives graceful shutdown of a worker.
+
+    Draining flips readiness to 503 and stops keep-alive reuse. Gunicorn
+    itself finishes in-flight requests (within graceful_timeout) before
+    worker_exit runs shutdown(), which disposes the DB pool, exports
+    queued spans and flushes log handlers.
+    """
+
+    def init_app(self, app):
+        @app.after_request
+        def close_connection_when_draining(response):
+            # Make nginx/clients reconnect to another backend instead of reusing this one
+            if readiness.draining:
+                response.headers["Connection"] = "close"
+            return response
+
+    def begin_draining(self, reason="shutdown"):
+        if not readiness.draining:
+            logger.info(f"Draining worker ({reason}), readiness now failing")
+        readiness.draining = True
+
+    def shutdown(self, app):
+        # No request can still be running here: the worker loop has stopped. Zero-error
+        # drain relies on the preStop sleep plus graceful_timeout, not on this hook.
+        self.begin_draining()
+
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+        logger.info("Database pool disposed")
+
+        tracer.flush()
+        flush_logs()
+
+
+def flush_logs():
+    """Flush every handler so queued/buffered log lines aren't lost on exit."""
+    loggers = [logging.getLogger()] + [
+        logger_obj for logger_obj in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger_obj, logging.Logger)
+    ]
+    for logger_obj in loggers:
+        for handler in logger_obj.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+
+lifecycle = Lifecycle()
@@ -0,0 +1,128 @@
+import logging
+import random
+import threading
+import time
+from app.extensions import LOG_RECORDS_DROPPED
+
+SAMPLED = "sampled"
+RATE_LIMITED = "rate_limited"
+DUPLICATE = "duplicate"
+
+
+def parse_log_rates(spec):
+    """
+    Parse "logger[:LEVEL]=rate,..." into {(logger, levelno or None): (kind, value)}.
+
+    A plain number keeps that fraction of records ("0.1"), "N/s" keeps at
+    most N records per second. Without a level the rule covers every level
+    below ERROR: errors are never sampled.
+    """
+    rules = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        target, _, rate = item.partition("=")
+        name, _, level = target.strip().partition(":")
+        levelno = logging.getLevelName(level.strip().upper()) if level else None
+        if level and not isinstance(levelno, int):
+            raise ValueError(f"Unknown log level in LOG_RATES: {level}")
+        rate = rate.strip()
+        if rate.endswith("/s"):
+            rule = (RATE_LIMITED, float(rate[:-2]))
+        else:
+            rule = (SAMPLED, float(rate))
+        rules[(name.strip(), levelno)] = rule
+    return rules
+
+
+class LogSamplingFilter(logging.Filter):
+    """
+    Drop a share of high-volume records before they are formatted.
+
+    Rules match the most specific logger prefix ("app.errors" also covers
+    "app.errors.x"), a rule with a level wins over one without. Identical
+    messages (same logger, level, text and exception type) within
+    `dedup_window` seconds are collapsed. ERROR and above always pass, so
+    every traceback is kept. What was dropped
+    is counted in `log_records_dropped_total` and announced as
+    "[N suppressed]" on the next record that gets through.
+    """
+
+    def __init__(self, rules=None, dedup_window=0.0, dedup_max_keys=10000, clock=time.monotonic, rand=random.random):
+        super().__init__()
+        self.rules = rules or {}
+        self.dedup_window = dedup_window
+        self.dedup_max_keys = dedup_max_keys
+        self._clock = clock
+        self._rand = rand
+        self._lock = threading.Lock()
+        self._resolved = {}      # (logger, levelno) -> rule key or None
+        self._buckets = {}       # rule key -> [tokens, last refill]
+        self._suppressed = {}    # rule key -> records dropped since the last one kept
+        self._seen = {}          # (logger, levelno, message, exc type) -> [window start, duplicates]
+
+    def _rule_for(self, name, levelno):
+        key = (name, levelno)
+        if key not in self._resolved:
+            best = None
+            for rule_name, rule_level in self.rules:
+                if rule_level not in (None, levelno):
+                    continue
+                if rule_name and name != rule_name and not name.startswith(rule_name + "."):
+                    continue
+                rank = (len(rule_name), rule_level is not None)
+                if best is None or rank > best[0]:
+                    best = (rank, (rule_name, rule_level))
+            self._resolved[key] = best[1] if best else None
+        return self._resolved[key]
+
+    def _allow(self, rule_key, now):
+        kind, value = self.rules[rule_key]
+        if kind == SAMPLED:
+            return self._rand() < value, SAMPLED
+        # Token bucket, one second worth of burst
+        bucket = self._buckets.setdefault(rule_key, [value, now])
+        bucket[0] = min(value, bucket[0] + (now - bucket[1]) * value)
+        bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True, RATE_LIMITED
+        return False, RATE_LIMITED
+
+    def _drop(self, record, reason):
+        LOG_RECORDS_DROPPED.labels(logger=record.name, level=record.levelname, reason=reason).inc()
+        return False
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+        now = self._clock()
+        rule_key = self._rule_for(record.name, record.levelno)
+        message = record.getMessage() if self.dedup_window else None
+        suppressed = 0
+
+        with self._lock:
+            if rule_key is not None:
+                allowed, reason = self._allow(rule_key, now)
+                if not allowed:
+                    self._suppressed[rule_key] = self._suppressed.get(rule_key, 0) + 1
+                    return self._drop(record, reason)
+                suppressed += self._suppressed.pop(rule_key, 0)
+
+            if self.dedup_window:
+                exc_type = record.exc_info[0] if record.exc_info else None
+                key = (record.name, record.levelno, message, exc_type)
+                seen = self._seen.get(key)
+                if seen is not None and now - seen[0] < self.dedup_window:
+                    seen[1] += 1
+                    return self._drop(record, DUPLICATE)
+                if seen is not None:
+                    suppressed += seen[1]
+                elif len(self._seen) >= self.dedup_max_keys:
+                    self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.dedup_window}
+                    if len(self._seen) >= self.dedup_max_keys:
+                        self._seen.clear()
+                self._seen[key] = [now, 0]
+
+        if suppressed:
+            record.msg = f"{message if message is not None else record.getMessage()} [{suppressed} suppressed]"
+            record.args = None
+        return True
@@ -2,6 +2,8 @@ import logging
 import sys
 import os
 import json
+from app.log_sampling import LogSamplingFilter, parse_log_rates
+from app.tracing import RequestIdFilter
 
 
 class JSONFormatter(logging.Formatter):
@@ -14,11 +16,17 @@ class JSONFormatter(logging.Formatter):
             "message": record.getMessage(),
             "log_type": "application"
         }
+        if hasattr(record, "request_id"):
+            log_record["request_id"] = record.request_id
         if record.exc_info:
             log_record["error"] = self.formatException(record.exc_info)
         return json.dumps(log_record)
     
 
+# "Fetched all students" on every list call, 404/400 noise from the error handlers
+DEFAULT_LOG_RATES = "app.services.student_service:INFO=0.1,app.errors:INFO=20/s,app.errors:WARNING=50/s"
+
+
 # Trying latest final
 def setup_logging():
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -26,6 +34,13 @@ def setup_logging():
 
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(getattr(logging, log_level, logging.INFO))
+    handler.addFilter(RequestIdFilter())
+    # Sampling / rate limits per logger and level + dedup of repeated messages
+    if os.getenv("LOG_SAMPLING_ENABLED", "true").lower() == "true":
+        handler.addFilter(LogSamplingFilter(
+            rules=parse_log_rates(os.getenv("LOG_RATES", DEFAULT_LOG_RATES)),
+            dedup_window=float(os.getenv("LOG_DEDUP_WINDOW", "0")),
+        ))
 
     if json_logs:
         handler.setFormatter(JSONFormatter())
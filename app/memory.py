@@ -0,0 +1,189 @@
+import logging
+import os
+import resource
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from flask import jsonify, request
+from app.extensions import WORKER_RECYCLES, WORKER_RSS
+from app.profiling import _is_authorized
+from app.utils.error_helpers import format_error_response
+
+logger = logging.getLogger(__name__)
+
+MEMORY_ENDPOINT = "/debug/memory"
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Allocations of the diagnostics themselves are noise
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def read_rss_bytes():
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        # No procfs (macOS): peak RSS is the best we get, in bytes there and KiB on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryDiagnostics:
+    """
+    tracemalloc snapshots diffed against a baseline, per worker.
+
+    Tracing is off unless started (at boot with MEMORY_TRACEMALLOC_ENABLED
+    or on demand), it slows allocations down noticeably while it runs.
+    """
+
+    def __init__(self):
+        self._baseline = None
+        self._lock = threading.Lock()
+        self._last_rss_update = 0.0
+
+    @property
+    def tracing(self):
+        return tracemalloc.is_tracing()
+
+    def start(self, frames=1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info(f"tracemalloc started ({frames} frames)")
+        self.reset()
+
+    def stop(self):
+        with self._lock:
+            self._baseline = None
+        tracemalloc.stop()
+
+    def reset(self):
+        """Take a new baseline, the next diff only shows what grew after this point."""
+        if not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            self._baseline = self._snapshot()
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def diff(self, limit=20, group_by="lineno"):
+        """Top allocation sites by growth since the baseline, baseline moves to now."""
+        if not tracemalloc.is_tracing():
+            return None
+        with self._lock:
+            current = self._snapshot()
+            baseline, self._baseline = self._baseline, current
+        if baseline is None:
+            stats = current.statistics(group_by)
+            stats = [(stat.traceback, stat.size, stat.count, stat.size, stat.count) for stat in stats]
+        else:
+            stats = [
+                (stat.traceback, stat.size_diff, stat.count_diff, stat.size, stat.count)
+                for stat in current.compare_to(baseline, group_by)
+            ]
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        return {
+            "traced_kb": round(current_bytes / 1024, 1),
+            "peak_kb": round(peak_bytes / 1024, 1),
+            "top": [
+                {
+                    "location": f"{tb[0].filename}:{tb[0].lineno}",
+                    "size_diff_kb": round(size_diff / 1024, 1),
+                    "count_diff": count_diff,
+                    "size_kb": round(size / 1024, 1),
+                    "count": count,
+                }
+                for tb, size_diff, count_diff, size, count in stats[:limit]
+            ],
+        }
+
+    def update_rss(self, min_interval=0.0):
+        """Refresh the RSS gauge, at most once per `min_interval` seconds."""
+        now = time.monotonic()
+        if now - self._last_rss_update < min_interval:
+            return None
+        self._last_rss_update = now
+        rss = read_rss_bytes()
+        WORKER_RSS.set(rss)
+        return rss
+
+    def log_diff(self, limit=20):
+        report = self.diff(limit)
+        if report is None:
+            logger.warning("Memory snapshot requested but tracemalloc is not running")
+            return
+        lines = "\n".join(
+            f"  {row['size_diff_kb']:+10.1f} KiB {row['count_diff']:+8d} blocks  {row['location']}"
+            for row in report["top"]
+        )
+        logger.warning(f"Memory growth since last snapshot (traced {report['traced_kb']} KiB):\n{lines}")
+
+
+memory = MemoryDiagnostics()
+
+
+def install_snapshot_signal(signum=signal.SIGUSR2, limit=20):
+    """`kill -USR2 <worker pid>` logs the allocation diff. Main thread only."""
+    def handle(sig, frame):
+        # Log from a thread: logging takes locks a signal handler may interrupt
+        threading.Thread(target=memory.log_diff, args=(limit,), name="memory-snapshot", daemon=True).start()
+    signal.signal(signum, handle)
+
+
+def should_recycle(max_rss_bytes):
+    """RSS check for the Gunicorn post_request hook: True once the worker should be replaced."""
+    rss = memory.update_rss()
+    if max_rss_bytes and rss > max_rss_bytes:
+        WORKER_RECYCLES.labels(reason="rss").inc()
+        logger.warning(
+            f"Worker {os.getpid()} RSS {rss / 2**20:.0f} MiB above {max_rss_bytes / 2**20:.0f} MiB, recycling"
+        )
+        return True
+    return False
+
+
+def register_memory_diagnostics(app):
+    """Per-worker RSS gauge, plus tracemalloc diffs on /debug/memory (token protected)."""
+    if not app.config.get("MEMORY_DIAGNOSTICS_ENABLED", True):
+        return
+    if app.config.get("MEMORY_TRACEMALLOC_ENABLED"):
+        memory.start(app.config.get("MEMORY_TRACEMALLOC_FRAMES", 1))
+    rss_interval = app.config.get("MEMORY_RSS_INTERVAL", 5.0)
+
+    @app.after_request
+    def update_rss_gauge(response):
+        memory.update_rss(rss_interval)
+        return response
+
+    @app.route(MEMORY_ENDPOINT, methods=["GET"], endpoint="debug_memory")
+    def debug_memory():
+        if not _is_authorized():
+            return jsonify(format_error_response("Forbidden")), 403
+
+        def flag(name):
+            return request.args.get(name, "").lower() == "true"
+
+        # start/reset only take a baseline, the next call shows what grew since
+        if flag("stop"):
+            memory.stop()
+        elif flag("start"):
+            memory.start(request.args.get("frames", app.config.get("MEMORY_TRACEMALLOC_FRAMES", 1), type=int))
+        elif flag("reset"):
+            memory.reset()
+
+        report = {"pid": os.getpid(), "rss_mb": round(memory.update_rss() / 2**20, 1), "tracing": memory.tracing}
+        if memory.tracing and not (flag("start") or flag("reset")):
+            group_by = request.args.get("group_by", "lineno")
+            if group_by not in ("lineno", "filename", "traceback"):
+                return jsonify(format_error_response("group_by must be lineno, filename or traceback")), 400
+            report.update(memory.diff(request.args.get("limit", 20, type=int), group_by))
+        return jsonify(report)
@@ -1 +1,4 @@
-from app.models.student import Student
\ No newline at end of file
+from app.models.student import Student
+from app.models.idempotency import IdempotencyKey
+from app.models.outbox import OutboxEvent
+from app.models.student_archive import StudentArchive
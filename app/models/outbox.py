@@ -0,0 +1,28 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class OutboxEvent(db.Model):
+    """Student change event, written in the same transaction as the change itself."""
+    __tablename__ = "outbox_events"
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(50), nullable=False)  # student.created / updated / deleted
+    aggregate_id = db.Column(db.Integer, nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    dispatched_at = db.Column(db.DateTime, nullable=True)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+
+    # Dispatcher only ever scans undelivered rows: keep that index tiny on Postgres
+    __table_args__ = (
+        db.Index(
+            "ix_outbox_events_pending", "id",
+            postgresql_where=db.text("dispatched_at IS NULL"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEvent {self.id} {self.event_type}>"
@@ -4,15 +4,35 @@ from datetime import datetime
 
 class Student(db.Model):
     __tablename__ = "students"
+    __table_args__ = (
+        # Case-insensitive uniqueness among live rows, also serves lower(email) lookups
+        db.Index(
+            "uq_students_email_lower_live", db.func.lower(db.text("email")), unique=True,
+            postgresql_where=db.text("deleted_at IS NULL"), sqlite_where=db.text("deleted_at IS NULL"),
+        ),
+        # Listing/paging live rows never has to step over tombstones
+        db.Index(
+            "ix_students_live_id", "id",
+            postgresql_where=db.text("deleted_at IS NULL"), sqlite_where=db.text("deleted_at IS NULL"),
+        ),
+        # Purge only scans tombstones
+        db.Index(
+            "ix_students_deleted_at", "deleted_at",
+            postgresql_where=db.text("deleted_at IS NOT NULL"), sqlite_where=db.text("deleted_at IS NOT NULL"),
+        ),
+        # Archival scans for rows not touched since a cutoff
+        db.Index("ix_students_updated_at", "updated_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     age = db.Column(db.Integer, nullable=False)
     grade = db.Column(db.String(20), nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
+    email = db.Column(db.String(120), nullable=False)  # unique per live student, see uq_students_email_lower_live
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=True)  # soft delete tombstone, purged later
 
     def __repr__(self):
         return f"<Student {self.name}>"
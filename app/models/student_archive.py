@@ -0,0 +1,20 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class StudentArchive(db.Model):
+    """Cold copy of inactive students moved out of `students` by `flask students archive`."""
+    __tablename__ = "students_archive"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # keeps the original student id
+    name = db.Column(db.String(100), nullable=False)
+    age = db.Column(db.Integer, nullable=False)
+    grade = db.Column(db.String(20), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+
+    created_at = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<StudentArchive {self.id}>"
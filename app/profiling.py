@@ -0,0 +1,172 @@
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from flask import Response, current_app, g, jsonify, request
+from app.utils.error_helpers import format_error_response
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENDPOINT = "/debug/profile"
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler.
+
+    A single daemon thread wakes up every `interval` seconds, grabs the frames
+    of the threads currently serving a sampled request and counts their
+    collapsed stacks per route. Nothing runs while no request is sampled.
+    """
+
+    def __init__(self, interval=0.005, max_stacks=50, max_depth=64):
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self._active = {}                      # thread id -> route
+        self._stacks = defaultdict(Counter)    # route -> Counter(collapsed stack)
+        self._requests = Counter()             # route -> sampled requests
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def start(self, route):
+        with self._lock:
+            self._active[threading.get_ident()] = route
+            self._requests[route] += 1
+        self._ensure_thread()
+        self._wakeup.set()
+
+    def stop(self):
+        with self._lock:
+            self._active.pop(threading.get_ident(), None)
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self._requests.clear()
+
+    def _ensure_thread(self):
+        # Threads don't survive Gunicorn's fork, start one per worker lazily
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._active:
+                self._wakeup.wait(timeout=1.0)
+                continue
+            self.sample()
+            time.sleep(self.interval)
+
+    def sample(self):
+        """Take one sample of every thread that is currently being profiled."""
+        frames = sys._current_frames()
+        with self._lock:
+            active = list(self._active.items())
+        for thread_id, route in active:
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+            stack = self._collapse(frame)
+            with self._lock:
+                counter = self._stacks[route]
+                counter[stack] += 1
+                # Keep memory bounded: only the hottest stacks survive
+                if len(counter) > self.max_stacks * 4:
+                    self._stacks[route] = Counter(dict(counter.most_common(self.max_stacks)))
+
+    def _collapse(self, frame):
+        parts = []
+        while frame is not None and len(parts) < self.max_depth:
+            code = frame.f_code
+            parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(parts))
+
+    def top(self, limit=None):
+        """Top stacks per route as plain dicts."""
+        limit = limit or self.max_stacks
+        with self._lock:
+            return {
+                route: {
+                    "requests": sampled,
+                    "samples": sum(self._stacks[route].values()),
+                    "stacks": [
+                        {"stack": stack, "count": count}
+                        for stack, count in self._stacks[route].most_common(limit)
+                    ],
+                }
+                for route, sampled in self._requests.items()
+            }
+
+    def collapsed(self):
+        """Brendan Gregg collapsed-stack format, ready for flamegraph.pl / speedscope."""
+        with self._lock:
+            lines = [
+                f"{route};{stack} {count}"
+                for route, counter in self._stacks.items()
+                for stack, count in counter.most_common()
+            ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+profiler = SamplingProfiler()
+
+
+def _is_authorized():
+    token = current_app.config.get("PROFILING_TOKEN")
+    supplied = request.headers.get("X-Debug-Token", "")
+    return bool(token) and hmac.compare_digest(supplied, token)
+
+
+def register_profiler(app):
+    """Register the sampling hooks. When profiling is disabled nothing is registered."""
+    if not app.config.get("PROFILING_ENABLED"):
+        return
+
+    sample_rate = float(app.config.get("PROFILING_SAMPLE_RATE", 0.01))
+    profiler.interval = app.config.get("PROFILING_INTERVAL_MS", 5) / 1000.0
+    profiler.max_stacks = app.config.get("PROFILING_MAX_STACKS", 50)
+    logger.info(f"Sampling profiler enabled for {sample_rate:.2%} of requests")
+
+    @app.before_request
+    def start_profiling():
+        if request.endpoint in (None, "metrics", "debug_profile"):
+            return
+        if random.random() < sample_rate:
+            g._profiling = True
+            profiler.start(request.endpoint)
+
+    @app.teardown_request
+    def stop_profiling(exc):
+        if g.pop("_profiling", False):
+            profiler.stop()
+
+    @app.route(PROFILE_ENDPOINT, methods=["GET"], endpoint="debug_profile")
+    def debug_profile():
+        if not _is_authorized():
+            return jsonify(format_error_response("Forbidden")), 403
+
+        if request.args.get("format") == "collapsed":
+            data = profiler.collapsed()
+            response = Response(data, mimetype="text/plain")
+        else:
+            limit = request.args.get("limit", type=int)
+            response = jsonify(profiler.top(limit))
+
+        if request.args.get("reset", "").lower() == "true":
+            profiler.reset()
+        return response
@@ -0,0 +1,254 @@
+import fcntl
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import g, jsonify, request
+from app.extensions import RATE_LIMIT_BACKEND_ERRORS, RATE_LIMITED_REQUESTS
+from app.utils.error_helpers import format_error_response
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 3600}
+
+Decision = namedtuple("Decision", "allowed remaining retry_after reset_after")
+
+
+def parse_limit(spec):
+    """"20/s" -> (20.0, 20), "600/m:50" -> (10.0, 50): tokens per second and bucket size."""
+    spec = spec.strip()
+    amount, _, rest = spec.partition("/")
+    period, _, burst = rest.partition(":")
+    if period not in PERIODS:
+        raise ValueError(f"Invalid rate limit {spec!r}, expected N/s, N/m or N/h with an optional :burst")
+    rate = float(amount) / PERIODS[period]
+    return rate, int(burst) if burst else max(1, int(float(amount)))
+
+
+def _take(tokens, last, now, rate, burst):
+    """Refill a bucket up to `now` and try to take one token."""
+    tokens = min(burst, tokens + max(0.0, now - last) * rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    return tokens, _decision(allowed, tokens, rate, burst)
+
+
+def _decision(allowed, tokens, rate, burst):
+    retry_after = 0.0 if allowed else (1 - tokens) / rate
+    return Decision(allowed, int(tokens), retry_after, (burst - tokens) / rate)
+
+
+class MemoryRateLimitStore:
+    """Token buckets in a dict, per worker: N workers effectively allow N times the limit."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, last refill], least recently used first
+        self._lock = threading.Lock()
+
+    def consume(self, key, rate, burst):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                while len(self._buckets) >= self.max_keys:
+                    # Evict the least recently seen client, never reset everyone's bucket
+                    self._buckets.popitem(last=False)
+                bucket = self._buckets[key] = [burst, now]
+            else:
+                self._buckets.move_to_end(key)
+            tokens, decision = _take(bucket[0], bucket[1], now, rate, burst)
+            bucket[0], bucket[1] = tokens, now
+        return decision
+
+
+class SharedMemoryRateLimitStore:
+    """
+    Token buckets in a memory-mapped file shared by every worker on the host.
+
+    Fixed-size open-addressing table of (key hash, tokens, last refill)
+    slots. A key probes `PROBES` neighbouring slots, which are locked with an
+    fcntl byte-range lock for cross-process atomicity (plus a thread lock,
+    fcntl locks don't exclude threads of the same process). When all probed
+    slots are taken, the stalest one is reused.
+    """
+
+    SLOT = struct.Struct("<Qdd")
+    PROBES = 8
+
+    def __init__(self, path, slots=65536):
+        self.path = path
+        self.slots = max(slots, self.PROBES)
+        size = self.slots * self.SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._lock = threading.Lock()
+
+    def _hash(self, key):
+        # 0 marks an empty slot
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    def consume(self, key, rate, burst):
+        slot_size = self.SLOT.size
+        key_hash = self._hash(key)
+        first = key_hash % (self.slots - self.PROBES + 1)
+        offset = first * slot_size
+        length = self.PROBES * slot_size
+
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, offset)
+            try:
+                now = time.monotonic()
+                target = empty = stalest = None
+                for position in range(offset, offset + length, slot_size):
+                    stored_hash, tokens, last = self.SLOT.unpack_from(self._map, position)
+                    if stored_hash == key_hash:
+                        target = position
+                        break
+                    if stored_hash == 0:
+                        empty = position if empty is None else empty
+                    elif stalest is None or last < stalest[1]:
+                        stalest = (position, last)
+
+                if target is None:
+                    target = empty if empty is not None else stalest[0]
+                    tokens, last = burst, now
+                tokens, decision = _take(tokens, last, now, rate, burst)
+                self.SLOT.pack_into(self._map, target, key_hash, tokens, now)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
+        return decision
+
+
+# Refill, take and expire in one round trip; TIME keeps replicas on the server's clock
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local last = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - last) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitStore:
+    """
+    Token buckets in any Redis-compatible server (Redis, Valkey, KeyDB...),
+    shared by every worker and replica. One EVALSHA per check.
+    """
+
+    def __init__(self, client, prefix="ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_REDIS_TOKEN_BUCKET)
+
+    @classmethod
+    def from_url(cls, url, timeout=0.05):
+        import redis  # optional dependency, only needed for this backend
+        return cls(redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout))
+
+    def consume(self, key, rate, burst):
+        allowed, tokens = self._script(keys=[self.prefix + key], args=[rate, burst])
+        return _decision(bool(int(allowed)), float(tokens), rate, burst)
+
+
+def build_store(app):
+    backend = app.config.get("RATE_LIMIT_BACKEND", "memory")
+    if backend == "redis":
+        return RedisRateLimitStore.from_url(app.config["RATE_LIMIT_REDIS_URL"])
+    if backend == "shm":
+        return SharedMemoryRateLimitStore(
+            app.config.get("RATE_LIMIT_SHM_PATH", "/dev/shm/student-api-ratelimit"),
+            slots=app.config.get("RATE_LIMIT_SHM_SLOTS", 65536),
+        )
+    return MemoryRateLimitStore()
+
+
+def _hash_api_key(api_key):
+    # Never keep raw credentials in the store
+    return hashlib.blake2b(api_key.encode(), digest_size=12).hexdigest()
+
+
+def _client_key(api_key_header, api_keys, trust_proxy):
+    api_key = request.headers.get(api_key_header)
+    if api_key:
+        digest = _hash_api_key(api_key)
+        # Only known keys get their own bucket: a made-up key per request must not buy a fresh one
+        if digest in api_keys:
+            return "key:" + digest
+    ip = request.headers.get("X-Real-IP") if trust_proxy else None
+    return "ip:" + (ip or request.remote_addr or "unknown")
+
+
+def client_key_func(app):
+    """Caller identity for per-client state: an allow-listed API key, otherwise the client IP."""
+    api_key_header = app.config.get("RATE_LIMIT_API_KEY_HEADER", "X-API-Key")
+    api_keys = {_hash_api_key(key) for key in app.config.get("RATE_LIMIT_API_KEYS", ())}
+    trust_proxy = app.config.get("RATE_LIMIT_TRUST_PROXY", True)
+    return lambda: _client_key(api_key_header, api_keys, trust_proxy)
+
+
+def register_rate_limiting(app, store=None):
+    """Token-bucket limits per client and route on the student API, 429 once a bucket is empty."""
+    if not app.config.get("RATE_LIMIT_ENABLED", True):
+        return
+    store = store or build_store(app)
+    app.extensions["rate_limit"] = store
+    limits = {endpoint: parse_limit(spec) for endpoint, spec in app.config.get("RATE_LIMITS", {}).items()}
+    default = limits.pop("default", None)
+    blueprints = set(app.config.get("RATE_LIMIT_BLUEPRINTS", ("students",)))
+    client_key = client_key_func(app)
+
+    @app.before_request
+    def check_rate_limit():
+        if request.blueprint not in blueprints:
+            return None
+        limit = limits.get(request.endpoint, default)
+        if limit is None:
+            return None
+        rate, burst = limit
+        group = request.endpoint if request.endpoint in limits else "default"
+        try:
+            decision = store.consume(f"{group}:{client_key()}", rate, burst)
+        except Exception:
+            # Fail open: a limiter outage must not take the API down with it
+            logger.warning("Rate limit backend unavailable, allowing request", exc_info=True)
+            RATE_LIMIT_BACKEND_ERRORS.inc()
+            return None
+
+        g._rate_limit = (burst, decision)
+        if decision.allowed:
+            return None
+        RATE_LIMITED_REQUESTS.labels(route=group).inc()
+        response = jsonify(format_error_response("Too many requests"))
+        response.status_code = 429
+        response.headers["Retry-After"] = str(math.ceil(decision.retry_after))
+        return response
+
+    @app.after_request
+    def add_rate_limit_headers(response):
+        state = g.pop("_rate_limit", None)
+        if state is not None:
+            burst, decision = state
+            response.headers["RateLimit-Limit"] = str(burst)
+            response.headers["RateLimit-Remaining"] = str(decision.remaining)
+            response.headers["RateLimit-Reset"] = str(math.ceil(decision.reset_after))
+        return response
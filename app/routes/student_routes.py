@@ -1,13 +1,27 @@
-from flask import Blueprint, request, jsonify
-from app.schemas.student_schema import StudentSchema
+from functools import lru_cache
+from flask import Blueprint, current_app, request, jsonify
+from marshmallow import ValidationError
 from app.services import student_service
 from app.extensions import db
+from app.tracing import tracer
 from app.utils.helpers import format_response
 
 
 student_bp = Blueprint("students", __name__, url_prefix="/api/v1")
 
-student_schema = StudentSchema()
+
+@lru_cache(maxsize=None)
+def get_student_schema():
+    """Build StudentSchema on first write so reads and worker boot skip marshmallow-sqlalchemy."""
+    from app.schemas.student_schema import StudentSchema
+    return StudentSchema()
+
+
+@lru_cache(maxsize=None)
+def get_student_update_schema():
+    """Partial StudentSchema returning a plain dict: validates and whitelists PUT/PATCH bodies."""
+    from app.schemas.student_schema import StudentSchema
+    return StudentSchema(partial=True, load_instance=False)
 
 
 # Healthcheck
@@ -25,7 +39,8 @@ def error_check():
 @student_bp.route("/students", methods=["POST"])
 def add_student():
     data = request.get_json()
-    student = student_schema.load(data, session=db.session)
+    with tracer.span("schema.load", schema="StudentSchema"):
+        student = get_student_schema().load(data, session=db.session)
     student_data = student_service.create_student(student)
     response = format_response(data=student_data, message="Student created")
     return jsonify(response), 201
@@ -33,21 +48,50 @@ def add_student():
 
 @student_bp.route("/students", methods=["GET"])
 def get_students():
+    email = request.args.get("email")
+    if email is not None:
+        # Filtered collection: [] or [student], served from the lower(email) index
+        student = student_service.get_student_by_email(email)
+        response = format_response(data=[student] if student else [], message="Students retrieved")
+        return jsonify(response), 200
+
     students = student_service.get_all_students()
     response = format_response(data=students, message="All students retrieved")
     return jsonify(response), 200
 
 
+def _parse_batch_ids(data):
+    limit = current_app.config.get("STUDENT_BATCH_GET_MAX_IDS", 100)
+    ids = data.get("ids") if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not ids:
+        raise ValidationError({"ids": ["Must be a non-empty list of student ids."]})
+    if len(ids) > limit:
+        raise ValidationError({"ids": [f"At most {limit} ids per request."]})
+    if not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        raise ValidationError({"ids": ["Ids must be integers."]})
+    return ids
+
+
+@student_bp.route("/students/batch-get", methods=["POST"])
+def batch_get_students():
+    ids = _parse_batch_ids(request.get_json(silent=True))
+    result = student_service.get_students_by_ids(ids)
+    response = format_response(data=result, message="Students retrieved")
+    return jsonify(response), 200
+
+
 @student_bp.route("/students/<int:student_id>", methods=["GET"])
 def get_student(student_id):
-    student = student_service.get_student_by_id(student_id)
+    include_archived = request.args.get("include_archived", "false").lower() == "true"
+    student = student_service.get_student_by_id(student_id, include_archived=include_archived)
     response = format_response(data=student, message="Student retrieved")
     return jsonify(response), 200
 
 
-@student_bp.route("/students/<int:student_id>", methods=["PUT"])
+@student_bp.route("/students/<int:student_id>", methods=["PUT", "PATCH"])
 def update_student(student_id):
-    data = request.get_json()
+    with tracer.span("schema.load", schema="StudentSchema", partial=True):
+        data = get_student_update_schema().load(request.get_json())
     student = student_service.update_student(student_id, data)
     response = format_response(data=student, message="Student updated")
     return jsonify(response), 200
@@ -1,6 +1,7 @@
 from app.extensions import ma
 from app.models.student import Student
-from marshmallow import validates, ValidationError, fields, validate
+from marshmallow import pre_load, validates, ValidationError, fields, validate
+from app.utils.helpers import normalize_email
 
 
 class StudentSchema(ma.SQLAlchemyAutoSchema):
@@ -16,6 +17,13 @@ class StudentSchema(ma.SQLAlchemyAutoSchema):
         fields = ("id", "name", "age", "grade", "email", "created_at", "updated_at")
         dump_only = ("id", "created_at", "updated_at") #Read-only fields
 
+    @pre_load
+    def normalize_email(self, data, **kwargs):
+        """Store emails in one canonical form so uniqueness is case-insensitive"""
+        if isinstance(data, dict) and "email" in data:
+            data = {**data, "email": normalize_email(data["email"])}
+        return data
+
     @validates('name')
     def validate_name(self, value):
         """Custom validation for complex rules built-in validators can't handle"""
@@ -0,0 +1,124 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, literal, select
+from app.extensions import db
+from app.models.student import Student
+from app.models.student_archive import StudentArchive
+from app.utils.db_helpers import pipeline
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_COLUMNS = ("id", "name", "age", "grade", "email", "created_at", "updated_at")
+
+
+def archive_batch(cutoff: datetime, batch_size: int = 1000):
+    """
+    Move up to `batch_size` live students not updated since `cutoff` into
+    `students_archive`, in one short transaction. Returns the number moved.
+
+    Rows are copied and deleted by primary key, so the transaction only ever
+    locks the batch itself. SKIP LOCKED leaves rows that a request is
+    writing right now for the next run.
+    """
+    students = Student.__table__
+    archive = StudentArchive.__table__
+    try:
+        ids = db.session.execute(
+            select(students.c.id)
+            .where(students.c.updated_at < cutoff, students.c.deleted_at.is_(None))  # tombstones are purged instead
+            .order_by(students.c.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not ids:
+            db.session.commit()
+            return 0
+
+        columns = [students.c[name] for name in ARCHIVED_COLUMNS]
+        # Copy and delete don't depend on each other's results: one round trip on psycopg
+        with pipeline(db.session):
+            db.session.execute(
+                insert(archive).from_select(
+                    list(ARCHIVED_COLUMNS) + ["archived_at"],
+                    select(*columns, literal(datetime.utcnow(), db.DateTime)).where(students.c.id.in_(ids)),
+                )
+            )
+            db.session.execute(delete(students).where(students.c.id.in_(ids)))
+        db.session.commit()
+    except Exception:
+        logger.exception("Failed archiving students batch")
+        db.session.rollback()
+        raise
+    return len(ids)
+
+
+def archive_inactive_students(older_than_days: float, batch_size: int = 1000, pause: float = 0.0,
+                              max_batches: int = None, progress=None):
+    """Archive in batches until nothing is left (or `max_batches`), sleeping `pause` between batches."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = archive_batch(cutoff, batch_size)
+        if not count:
+            break
+        moved += count
+        batches += 1
+        if progress:
+            progress(moved)
+        if pause:
+            time.sleep(pause)  # let replication and vacuum keep up
+    logger.info(f"Archived {moved} students not updated since {cutoff.isoformat()}")
+    return moved
+
+
+def get_archived_student(student_id: int):
+    student = db.session.get(StudentArchive, student_id)
+    if student is None:
+        return None
+    return {
+        "id": student.id,
+        "name": student.name,
+        "email": student.email,
+        "archived": True,
+    }
+
+
+def purge_batch(cutoff: datetime, batch_size: int = 1000):
+    """Physically delete up to `batch_size` students soft-deleted before `cutoff`. Returns the number removed."""
+    students = Student.__table__
+    try:
+        ids = db.session.execute(
+            select(students.c.id)
+            .where(students.c.deleted_at < cutoff)
+            .order_by(students.c.deleted_at)  # range scan on the tombstone-only index
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if ids:
+            db.session.execute(delete(students).where(students.c.id.in_(ids)))
+        db.session.commit()
+    except Exception:
+        logger.exception("Failed purging deleted students batch")
+        db.session.rollback()
+        raise
+    return len(ids)
+
+
+def purge_deleted_students(older_than_hours: float, batch_size: int = 1000, pause: float = 0.0,
+                           max_batches: int = None, progress=None):
+    """Remove soft-deleted students in chunks, same batching as archive_inactive_students."""
+    cutoff = datetime.utcnow() - timedelta(hours=older_than_hours)
+    removed = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = purge_batch(cutoff, batch_size)
+        if not count:
+            break
+        removed += count
+        batches += 1
+        if progress:
+            progress(removed)
+        if pause:
+            time.sleep(pause)
+    logger.info(f"Purged {removed} students deleted before {cutoff.isoformat()}")
+    return removed
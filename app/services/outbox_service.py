@@ -0,0 +1,107 @@
+import json
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from app.extensions import (
+    db, OUTBOX_DISPATCHED, OUTBOX_DISPATCH_FAILURES, OUTBOX_LAG_SECONDS, OUTBOX_PENDING
+)
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+def student_snapshot(student):
+    return {
+        "id": student.id,
+        "name": student.name,
+        "age": student.age,
+        "grade": student.grade,
+        "email": student.email,
+    }
+
+
+def record_event(event_type: str, aggregate_id: int, payload: dict):
+    """Queue an event on the current session; it commits (or rolls back) with the caller's change."""
+    db.session.add(OutboxEvent(
+        event_type=event_type,
+        aggregate_id=aggregate_id,
+        payload=json.dumps(payload),
+        attempts=0,
+    ))
+
+
+def _envelope(event):
+    return {
+        "id": event.id,
+        "type": event.event_type,
+        "aggregate_id": event.aggregate_id,
+        "occurred_at": event.created_at.isoformat() + "Z",
+        "data": json.loads(event.payload),
+    }
+
+
+def dispatch_batch(sink, batch_size: int = 100):
+    """
+    Send the oldest undelivered events to `sink` and mark them delivered.
+
+    At-least-once: rows are only marked after the sink accepted the batch, so
+    a crash in between re-sends them. Consumers dedupe on the event id.
+    SKIP LOCKED lets several dispatchers run side by side on Postgres.
+    """
+    events = (
+        OutboxEvent.query
+        .filter(OutboxEvent.dispatched_at.is_(None))
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not events:
+        db.session.commit()
+        return 0
+
+    try:
+        sink.send([_envelope(event) for event in events])
+    except Exception as err:
+        logger.warning(f"Outbox dispatch of {len(events)} events failed: {err}")
+        for event in events:
+            event.attempts += 1
+            event.last_error = str(err)[:1000]
+        db.session.commit()
+        OUTBOX_DISPATCH_FAILURES.inc()
+        return 0
+
+    now = datetime.utcnow()
+    for event in events:
+        event.attempts += 1
+        event.dispatched_at = now
+        event.last_error = None
+    db.session.commit()
+    OUTBOX_DISPATCHED.inc(len(events))
+    logger.info(f"Dispatched {len(events)} outbox events")
+    return len(events)
+
+
+def update_lag_metrics():
+    """Pending count and age of the oldest undelivered event."""
+    pending, oldest = (
+        db.session.query(func.count(OutboxEvent.id), func.min(OutboxEvent.created_at))
+        .filter(OutboxEvent.dispatched_at.is_(None))
+        .one()
+    )
+    db.session.commit()
+    lag = (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+    OUTBOX_PENDING.set(pending)
+    OUTBOX_LAG_SECONDS.set(lag)
+    return pending, lag
+
+
+def purge_dispatched(older_than_hours: float):
+    cutoff = datetime.utcnow() - timedelta(hours=older_than_hours)
+    removed = (
+        OutboxEvent.query
+        .filter(OutboxEvent.dispatched_at.isnot(None), OutboxEvent.dispatched_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.session.commit()
+    return removed
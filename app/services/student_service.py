@@ -1,18 +1,44 @@
 import logging
-from app.extensions import db
+from datetime import datetime
+from marshmallow import ValidationError
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db, db_breaker
 from app.models.student import Student
 from app.utils.custom_errors import DuplicateError, NotFoundError
+from app.services.archive_service import get_archived_student
+from app.services.outbox_service import record_event, student_snapshot
+from app.tracing import traced
+from app.utils.helpers import normalize_email
 
 logger = logging.getLogger(__name__)
 
+# Columns a client may change through PUT/PATCH
+UPDATABLE_FIELDS = ("name", "age", "grade", "email")
 
+
+def _live_students():
+    # deleted_at IS NULL lets the planner use the partial indexes on live rows
+    return Student.query.filter(Student.deleted_at.is_(None))
+
+
+def _find_by_email(email):
+    # lower(email) matches the uq_students_email_lower_live index, also catches legacy mixed-case rows
+    return _live_students().filter(func.lower(Student.email) == normalize_email(email)).first()
+
+
+@traced()
+@db_breaker
 def create_student(student):
-    existing = Student.query.filter_by(email=student.email).first()
+    student.email = normalize_email(student.email)
+    existing = _find_by_email(student.email)
     if existing:
         raise DuplicateError("A student with this email already exists")
 
     try:
         db.session.add(student)
+        db.session.flush()  # assigns student.id for the outbox event
+        record_event("student.created", student.id, student_snapshot(student))
         db.session.commit()
         logger.info(f"Student created: {student}")
         return {
@@ -30,14 +56,26 @@ def generate_error():
     raise Exception("This is a generated error for testing purposes")
     
 
+@traced()
+@db_breaker
 def get_all_students():
-    students = Student.query.all()
+    # Plain rows, not ORM instances: nothing lands in the session's identity map
+    rows = db.session.execute(
+        select(Student.id, Student.name, Student.email).where(Student.deleted_at.is_(None))
+    ).all()
     logger.info("Fetched all students")
-    return [{"id": s.id, "name": s.name, "email": s.email} for s in students]
+    return [{"id": r.id, "name": r.name, "email": r.email} for r in rows]
     
 
-def get_student_by_id(student_id: int):
-    student = Student.query.get(student_id)
+@traced()
+@db_breaker
+def get_student_by_id(student_id: int, include_archived: bool = False):
+    student = _live_students().filter(Student.id == student_id).first()
+    if not student and include_archived:
+        # Cold path: only when the caller asks for historical records
+        archived = get_archived_student(student_id)
+        if archived:
+            return archived
     if not student:
         logger.warning(f"Student {student_id} not found")
         raise NotFoundError(f"Student with id {student_id} not found")
@@ -48,43 +86,99 @@ def get_student_by_id(student_id: int):
     }
     
 
-def update_student(student_id: int, data: dict):
-    student = Student.query.get(student_id)
+@traced()
+@db_breaker
+def get_student_by_email(email: str):
+    student = _find_by_email(email)
+    logger.info("Fetched student by email")
     if not student:
-        logger.warning(f"Student {student_id} not found")
-        raise NotFoundError(f"Student with id {student_id} not found")
+        return None
+    return {
+        "id": student.id,
+        "name": student.name,
+        "email": student.email
+    }
+
 
-    # if updating email
-    if "email" in data and data["email"] != student.email:
-        if Student.query.filter_by(email=data["email"]).first():
-            logger.warning(f"Duplicate email update attempt: {data['email']}")
-            raise DuplicateError("Email already exists")
+@traced()
+@db_breaker
+def get_students_by_ids(student_ids: list):
+    # Single WHERE id IN (...) round trip, results keep the requested order
+    unique_ids = list(dict.fromkeys(student_ids))
+    found = {s.id: s for s in _live_students().filter(Student.id.in_(unique_ids)).all()}
+    missing = [i for i in unique_ids if i not in found]
+    logger.info(f"Batch fetched {len(found)} students, {len(missing)} missing")
+    return {
+        "students": [
+            {"id": found[i].id, "name": found[i].name, "email": found[i].email}
+            for i in unique_ids if i in found
+        ],
+        "missing_ids": missing,
+    }
 
+
+@traced()
+@db_breaker
+def update_student(student_id: int, data: dict):
+    unknown = set(data) - set(UPDATABLE_FIELDS)
+    if unknown:
+        raise ValidationError({field: ["Field cannot be updated."] for field in sorted(unknown)})
+    values = dict(data)
+    if "email" in values:
+        values["email"] = normalize_email(values["email"])
+
+    # One UPDATE ... RETURNING: zero rows is "not found", the unique index catches duplicate emails
     try:
-        for key, value in data.items():
-            setattr(student, key, value)
+        row = db.session.execute(
+            update(Student)
+            .where(Student.id == student_id, Student.deleted_at.is_(None))
+            .values(**values)
+            .returning(Student.id, Student.name, Student.age, Student.grade, Student.email)
+            .execution_options(synchronize_session=False)
+        ).first()
+    except IntegrityError:
+        db.session.rollback()
+        if "email" not in values:
+            raise
+        logger.warning(f"Duplicate email update attempt: {values['email']}")
+        raise DuplicateError("Email already exists")
+    if row is None:
+        logger.warning(f"Student {student_id} not found")
+        raise NotFoundError(f"Student with id {student_id} not found")
 
+    try:
+        record_event("student.updated", row.id, dict(row._mapping))
         db.session.commit()
-        logger.info(f"Student updated: {student}")
+        logger.info(f"Student updated: {row.id}")
         return {
-            "id": student.id,
-            "name": student.name,
-            "email": student.email
+            "id": row.id,
+            "name": row.name,
+            "email": row.email
         }
-    
     except Exception:
         logger.exception(f"Failed updating student {student_id}")
         db.session.rollback()
         raise
-    
 
+
+@traced()
+@db_breaker
 def delete_student(student_id: int):
-    student = Student.query.get(student_id)
-    if not student:
+    # Soft delete: one single-row UPDATE on the request path, the purge command removes the row later
+    now = datetime.utcnow()
+    deleted = db.session.execute(
+        update(Student)
+        .where(Student.id == student_id, Student.deleted_at.is_(None))
+        .values(deleted_at=now, updated_at=now)
+        .returning(Student.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if deleted is None:
         logger.warning(f"Student {student_id} not found")
         raise NotFoundError(f"Student with id {student_id} not found")
+
     try:
-        db.session.delete(student)
+        record_event("student.deleted", student_id, {"id": student_id})
         db.session.commit()
         logger.info(f"Student deleted: {student_id}")
         return {"student_id": student_id}
@@ -92,4 +186,3 @@ def delete_student(student_id: int):
         logger.exception(f"Failed deleting student {student_id}")
         db.session.rollback()
         raise
-    
\ No newline at end of file
@@ -0,0 +1,136 @@
+import logging
+import math
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from flask import g, jsonify, request
+from prometheus_client import Histogram
+from app.extensions import SLO_BUDGET_BURN, SLO_LATENCY_TARGET, SLO_OBJECTIVE, SLO_REQUESTS
+from app.health import PROBE_PATHS
+from app.profiling import _is_authorized
+from app.utils.error_helpers import format_error_response
+
+logger = logging.getLogger(__name__)
+
+LATENCY_ENDPOINT = "/debug/latency"
+DEFAULT_CLASS = "default"
+
+_UNSAFE_NAME = re.compile(r"[^a-z0-9_]")
+
+# One histogram per route class and process: bucket layouts differ per class,
+# and prometheus_client only allows one layout per metric name
+_histograms = {}         # name -> (histogram, buckets it was created with)
+_histograms_lock = threading.Lock()
+
+
+def route_histogram(route_class, buckets):
+    """Latency histogram for a route class, created once per process."""
+    name = f"http_{_UNSAFE_NAME.sub('_', route_class.lower())}_request_duration_seconds"
+    layout = sorted(float(b) for b in buckets)
+    with _histograms_lock:
+        if name not in _histograms:
+            histogram = Histogram(
+                name,
+                f"HTTP request latency of {route_class} routes in seconds",
+                ['method', 'route'],
+                buckets=buckets,
+            )
+            _histograms[name] = (histogram, layout)
+        histogram, registered = _histograms[name]
+        if registered != layout:
+            logger.warning(f"Buckets for {name} already registered in this process, keeping the first layout")
+    return histogram
+
+
+class LatencyQuantiles:
+    """
+    Recent latencies per route in a fixed-size window, this worker only.
+
+    Meant for local debugging (`/debug/latency`). Prometheus histograms stay
+    the source of truth across workers, since a Summary's quantiles can't be
+    merged by the multiprocess collector.
+    """
+
+    def __init__(self, window=1024):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def observe(self, route, seconds):
+        with self._lock:
+            self._samples[route].append(seconds)
+
+    def snapshot(self, quantiles=(0.5, 0.9, 0.95, 0.99)):
+        with self._lock:
+            samples = {route: sorted(values) for route, values in self._samples.items()}
+        result = {}
+        for route, values in samples.items():
+            stats = {"count": len(values)}
+            for q in quantiles:
+                # Nearest-rank quantile
+                index = max(0, math.ceil(q * len(values)) - 1)
+                stats[f"p{q * 100:g}"] = round(values[index] * 1000, 3)
+            stats["max"] = round(values[-1] * 1000, 3)
+            result[route] = stats
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+latency_quantiles = LatencyQuantiles()
+
+
+def register_slo_metrics(app):
+    """Per-route-class latency histograms, SLO error-budget counters and the in-process quantile view."""
+    route_classes = app.config.get("METRICS_ROUTE_CLASSES", {})
+    buckets = app.config.get("METRICS_BUCKETS", {})
+    targets = app.config.get("SLO_TARGETS", {})
+    latency_quantiles.window = app.config.get("LATENCY_QUANTILES_WINDOW", 1024)
+
+    histograms = {
+        route_class: route_histogram(route_class, layout) for route_class, layout in buckets.items()
+    }
+    for slo_class, target in targets.items():
+        SLO_OBJECTIVE.labels(slo_class=slo_class).set(target["objective"])
+        SLO_LATENCY_TARGET.labels(slo_class=slo_class).set(target["latency"])
+
+    @app.before_request
+    def start_slo_timer():
+        g._slo_started = time.perf_counter()
+
+    @app.after_request
+    def record_slo(response):
+        started = g.pop("_slo_started", None)
+        if started is None or request.path in PROBE_PATHS or request.path.startswith("/debug/"):
+            return response
+
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        route_class = route_classes.get(request.endpoint, DEFAULT_CLASS)
+
+        histogram = histograms.get(route_class) or histograms.get(DEFAULT_CLASS)
+        if histogram is not None:
+            histogram.labels(method=request.method, route=route).observe(elapsed)
+        latency_quantiles.observe(f"{request.method} {route}", elapsed)
+
+        target = targets.get(route_class) or targets.get(DEFAULT_CLASS)
+        if target is not None:
+            slo_class = route_class if route_class in targets else DEFAULT_CLASS
+            SLO_REQUESTS.labels(route=route, slo_class=slo_class).inc()
+            if response.status_code >= 500:
+                SLO_BUDGET_BURN.labels(route=route, slo_class=slo_class, reason="error").inc()
+            elif elapsed > target["latency"]:
+                SLO_BUDGET_BURN.labels(route=route, slo_class=slo_class, reason="latency").inc()
+        return response
+
+    @app.route(LATENCY_ENDPOINT, methods=["GET"], endpoint="debug_latency")
+    def debug_latency():
+        if not _is_authorized():
+            return jsonify(format_error_response("Forbidden")), 403
+        response = jsonify(latency_quantiles.snapshot())
+        if request.args.get("reset", "").lower() == "true":
+            latency_quantiles.reset()
+        return response
@@ -0,0 +1,402 @@
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.db_instrumentation import normalize_sql
+from app.extensions import TRACING_SPANS_DROPPED
+from app.utils.event_sinks import StreamSink
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:\-]{1,128}$")
+# W3C trace context: version-trace_id-parent_id-flags
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+request_id_var = ContextVar("request_id", default=None)
+_current_span = ContextVar("current_span", default=None)
+
+
+def get_request_id():
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp the current request id on every record (read by both JSON formatters)."""
+
+    def filter(self, record):
+        request_id = request_id_var.get()
+        if request_id is not None and not hasattr(record, "request_id"):
+            record.request_id = request_id
+        return True
+
+
+class Span:
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name, trace_id, parent_id=None, kind=SPAN_KIND_INTERNAL, attributes=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class JsonLinesSpanExporter:
+    """Finished spans as JSON lines on stdout or appended to a file."""
+
+    def __init__(self, path=None):
+        self.sink = StreamSink(path)
+
+    def export(self, spans):
+        self.sink.send([span.to_dict() for span in spans])
+
+
+class OTLPHttpSpanExporter:
+    """
+    POST spans as OTLP/HTTP JSON (`/v1/traces`) to a collector.
+
+    Plain urllib, no opentelemetry SDK needed in the serving image.
+    """
+
+    def __init__(self, endpoint, service_name="student-api", timeout=5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def _value(value):
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _span(self, span):
+        otlp = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": k, "value": self._value(v)} for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+        }
+        if span.parent_id:
+            otlp["parentSpanId"] = span.parent_id
+        return otlp
+
+    def payload(self, spans):
+        return {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": self.service_name}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": [self._span(s) for s in spans]}],
+        }]}
+
+    def export(self, spans):
+        body = json.dumps(self.payload(spans)).encode("utf-8")
+        req = urllib.request.Request(
+            self.endpoint, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            resp.read()
+
+
+def build_exporter(target, service_name="student-api", timeout=5.0):
+    """
+    "stdout"              -> JSON lines on stdout
+    "file:/path/x.jsonl"  -> JSON lines appended to a file
+    "http(s)://.../v1/traces" -> OTLP/HTTP JSON collector
+    """
+    if not target or target == "stdout":
+        return JsonLinesSpanExporter()
+    if target.startswith("file:"):
+        return JsonLinesSpanExporter(target[len("file:"):])
+    if target.startswith(("http://", "https://")):
+        return OTLPHttpSpanExporter(target, service_name=service_name, timeout=timeout)
+    raise ValueError(f"Unknown span exporter: {target}")
+
+
+class BatchSpanProcessor:
+    """
+    Queue finished spans and export them from a background thread.
+
+    Requests only pay for a deque append. The queue is bounded: when the
+    exporter can't keep up, new spans are dropped and counted instead of
+    growing the worker's memory.
+    """
+
+    def __init__(self, exporter, max_queue_size=2048, batch_size=256, schedule_delay=2.0):
+        self.exporter = exporter
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.schedule_delay = schedule_delay
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def on_end(self, span):
+        with self._lock:
+            if len(self._queue) >= self.max_queue_size:
+                TRACING_SPANS_DROPPED.labels(reason="queue_full").inc()
+                return
+            self._queue.append(span)
+            full = len(self._queue) >= self.batch_size
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+
+    def _ensure_thread(self):
+        # Threads don't survive Gunicorn's fork, start one per worker lazily
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(timeout=self.schedule_delay)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Export everything queued so far, in batches."""
+        with self._export_lock:
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not batch:
+                    return
+                try:
+                    self.exporter.export(batch)
+                except Exception:
+                    logger.exception(f"Failed to export {len(batch)} spans")
+                    TRACING_SPANS_DROPPED.labels(reason="export_error").inc(len(batch))
+
+
+class Tracer:
+    """
+    Minimal OpenTelemetry-style tracer.
+
+    Spans only exist below a sampled request span: when tracing is disabled,
+    or outside a request, `span()` is one ContextVar lookup.
+    """
+
+    def __init__(self):
+        self.processor = None
+        self.sample_rate = 1.0
+
+    def configure(self, processor, sample_rate=1.0):
+        self.processor = processor
+        self.sample_rate = sample_rate
+
+    def start_root(self, name, trace_id=None, parent_id=None, attributes=None):
+        if self.processor is None or random.random() >= self.sample_rate:
+            return None
+        span = Span(name, trace_id or secrets.token_hex(16), parent_id, SPAN_KIND_SERVER, attributes)
+        _current_span.set(span)
+        return span
+
+    def end_root(self, span, error=None):
+        _current_span.set(None)
+        self._finish(span, error)
+
+    def start_child(self, name, kind=SPAN_KIND_INTERNAL, attributes=None):
+        parent = _current_span.get()
+        if parent is None or self.processor is None:
+            return None, None
+        span = Span(name, parent.trace_id, parent.span_id, kind, attributes)
+        return span, _current_span.set(span)
+
+    def end_child(self, span, token, error=None):
+        _current_span.reset(token)
+        self._finish(span, error)
+
+    def _finish(self, span, error):
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        self.processor.on_end(span)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        span, token = self.start_child(name, attributes=attributes)
+        if span is None:
+            yield None
+            return
+        try:
+            yield span
+        except Exception as exc:
+            self.end_child(span, token, exc)
+            raise
+        self.end_child(span, token)
+
+    def flush(self):
+        if self.processor is not None:
+            self.processor.flush()
+
+
+tracer = Tracer()
+
+
+def traced(name=None):
+    """Record a span around a function when it runs inside a traced request."""
+    def decorator(func):
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _sql_span_start(conn, cursor, statement, parameters, context, executemany):
+    span, token = tracer.start_child("sql", SPAN_KIND_CLIENT)
+    if span is not None:
+        span.set_attribute("db.system", conn.dialect.name)
+        span.set_attribute("db.statement", normalize_sql(statement))
+        conn.info.setdefault("trace_spans", []).append((span, token))
+
+
+def _sql_span_end(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        span, token = spans.pop()
+        tracer.end_child(span, token)
+
+
+def _sql_span_error(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get("trace_spans") if conn is not None else None
+    if spans:
+        span, token = spans.pop()
+        tracer.end_child(span, token, exception_context.original_exception)
+
+
+def install_sql_listeners():
+    """Attach the SQL span listeners once per process."""
+    for name, listener in (
+        ("before_cursor_execute", _sql_span_start),
+        ("after_cursor_execute", _sql_span_end),
+        ("handle_error", _sql_span_error),
+    ):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+
+def _incoming_request_id(trust_incoming):
+    supplied = request.headers.get(REQUEST_ID_HEADER, "") if trust_incoming else ""
+    if _VALID_REQUEST_ID.match(supplied):
+        return supplied
+    return secrets.token_hex(16)
+
+
+def register_tracing(app):
+    """Request ids on every request, plus request/service/schema/SQL spans when TRACING_ENABLED."""
+    trust_incoming = app.config.get("REQUEST_ID_TRUST_INCOMING", True)
+    tracing_enabled = app.config.get("TRACING_ENABLED", False)
+
+    if tracing_enabled:
+        exporter = build_exporter(
+            app.config.get("TRACING_EXPORTER", "stdout"),
+            service_name=app.config.get("TRACING_SERVICE_NAME", "student-api"),
+        )
+        processor = BatchSpanProcessor(
+            exporter,
+            max_queue_size=app.config.get("TRACING_MAX_QUEUE_SIZE", 2048),
+            batch_size=app.config.get("TRACING_BATCH_SIZE", 256),
+            schedule_delay=app.config.get("TRACING_EXPORT_INTERVAL", 2.0),
+        )
+        tracer.configure(processor, sample_rate=app.config.get("TRACING_SAMPLE_RATE", 1.0))
+        install_sql_listeners()
+        logger.info(f"Tracing enabled, exporting to {app.config.get('TRACING_EXPORTER', 'stdout')}")
+
+    @app.before_request
+    def start_request_trace():
+        request_id = _incoming_request_id(trust_incoming)
+        request_id_var.set(request_id)
+        g.request_id = request_id
+
+        if not tracing_enabled or request.path.startswith(("/metrics", "/healthcheck")):
+            return
+        trace_id = parent_id = None
+        match = _TRACEPARENT.match(request.headers.get("traceparent", ""))
+        if match:
+            trace_id, parent_id = match.groups()
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        g._trace_span = tracer.start_root(
+            f"{request.method} {route}",
+            trace_id=trace_id,
+            parent_id=parent_id,
+            attributes={"http.method": request.method, "http.route": route, "request.id": request_id},
+        )
+
+    @app.after_request
+    def add_request_id_header(response):
+        response.headers[REQUEST_ID_HEADER] = g.get("request_id", "")
+        span = g.get("_trace_span")
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+        return response
+
+    @app.teardown_request
+    def end_request_trace(exc):
+        span = g.pop("_trace_span", None)
+        if span is not None:
+            tracer.end_root(span, exc)
+        request_id_var.set(None)
@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from functools import wraps
+from sqlalchemy.exc import OperationalError, InterfaceError, TimeoutError as PoolTimeoutError
+from app.utils.custom_errors import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Gauge values exported to Prometheus
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Only infrastructure failures trip the breaker, not integrity/validation errors
+BREAKER_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError)
+
+
+class CircuitBreaker:
+    """
+    Per-process circuit breaker for the database.
+
+    closed    -> calls pass through, consecutive failures are counted
+    open      -> calls fail fast with ServiceUnavailableError
+    half_open -> after reset_timeout a single probe call is let through;
+                 success closes the breaker, failure opens it again
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0,
+                 state_gauge=None, rejection_counter=None, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.enabled = True
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state_gauge = state_gauge.labels(breaker=name) if state_gauge is not None else None
+        self._rejections = rejection_counter.labels(breaker=name) if rejection_counter is not None else None
+        self.reset()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("DB_BREAKER_ENABLED", True)
+        self.failure_threshold = app.config.get("DB_BREAKER_FAILURE_THRESHOLD", self.failure_threshold)
+        self.reset_timeout = app.config.get("DB_BREAKER_RESET_TIMEOUT", self.reset_timeout)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+            self._set_state(CLOSED)
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    def _set_state(self, state):
+        if getattr(self, "_state", CLOSED) != state:
+            logger.warning(f"Circuit breaker '{self.name}' is now {state}")
+        self._state = state
+        if self._state_gauge is not None:
+            self._state_gauge.set(STATE_VALUES[state])
+
+    def before_call(self):
+        """Raise ServiceUnavailableError if the call must not reach the database."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            retry_after = max(0, self.reset_timeout - (self._clock() - self._opened_at))
+        if self._rejections is not None:
+            self._rejections.inc()
+        raise ServiceUnavailableError("Database temporarily unavailable", retry_after=int(retry_after) + 1)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self._state != CLOSED:
+                self._opened_at = None
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._set_state(OPEN)
+
+    def __call__(self, func):
+        """Use the breaker as a decorator on service functions."""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            self.before_call()
+            try:
+                result = func(*args, **kwargs)
+            except BREAKER_ERRORS:
+                self.record_failure()
+                raise
+            except Exception:
+                # Business errors (not found, duplicate, ...) mean the DB answered
+                self.record_success()
+                raise
+            self.record_success()
+            return result
+        return wrapper
@@ -5,3 +5,9 @@ class DuplicateError(Exception):
 class NotFoundError(Exception):
     """404 Not Found"""
     pass
+
+class ServiceUnavailableError(Exception):
+    """503 Service Unavailable"""
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,69 @@
+import random
+from itertools import accumulate
+from datetime import datetime, timedelta
+
+FIRST_NAMES = (
+    "Olivia", "Liam", "Emma", "Noah", "Amelia", "Oliver", "Ava", "Elijah", "Sophia", "Lucas",
+    "Isabella", "Mateo", "Mia", "Levi", "Charlotte", "Ethan", "Harper", "James", "Luna", "Asher",
+    "Aarav", "Priya", "Wei", "Mei", "Hiroshi", "Yuki", "Fatima", "Omar", "Chloe", "Diego",
+    "Sofia", "Arjun", "Ananya", "Kwame", "Amara", "Ivan", "Elena", "Jakub", "Zofia", "Lars",
+)
+
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee",
+    "Patel", "Sharma", "Wang", "Li", "Zhang", "Tanaka", "Sato", "Khan", "Ali", "Nguyen",
+    "Kim", "Okafor", "Mensah", "Ivanov", "Novak", "Kowalski", "Jensen", "Silva", "Rossi", "Muller",
+)
+
+EMAIL_DOMAINS = ("example.com", "example.org", "school.test", "mail.test")
+
+# Grade for each school age, everyone older counts as "College"
+GRADES_BY_AGE = {5: "K", 6: "1st", 7: "2nd", 8: "3rd"}
+GRADES_BY_AGE.update({age: f"{age - 5}th" for age in range(9, 18)})
+
+# Mostly K-12 ages, a thin tail of older students
+AGE_WEIGHTS = [(age, 10) for age in range(5, 18)] + [(age, 1) for age in range(18, 31)]
+
+
+# Rows per RNG stream: any chunk can be regenerated without replaying the ones before it
+CHUNK_SIZE = 10000
+
+# Timestamps count back from a fixed point so the same seed gives the same rows on any day
+EPOCH = datetime(2026, 1, 1)
+
+
+def generate_students(count, seed=42, start=0, now=None, history_days=3 * 365):
+    """
+    Yield `count` student rows as dicts, deterministic for a given (seed, start).
+
+    Emails embed the row index so they stay unique at any scale, a second
+    run with `start` past the first run's rows appends new students.
+    `created_at` is spread over the `history_days` days before `now`
+    (EPOCH unless given).
+    """
+    now = now or EPOCH
+    ages, weights = zip(*AGE_WEIGHTS)
+    cum_weights = list(accumulate(weights))
+    history_seconds = history_days * 86400
+    end = start + count
+
+    for chunk_start in range(start - start % CHUNK_SIZE, end, CHUNK_SIZE):
+        rng = random.Random(f"{seed}:{chunk_start}")
+        choice, choices, randrange = rng.choice, rng.choices, rng.randrange
+        for index in range(chunk_start, min(chunk_start + CHUNK_SIZE, end)):
+            first = choice(FIRST_NAMES)
+            last = choice(LAST_NAMES)
+            age = choices(ages, cum_weights=cum_weights)[0]
+            created_at = now - timedelta(seconds=randrange(history_seconds))
+            domain = choice(EMAIL_DOMAINS)
+            if index < start:
+                continue  # keep the stream aligned when start is mid-chunk
+            yield {
+                "name": f"{first} {last}",
+                "age": age,
+                "grade": GRADES_BY_AGE.get(age, "College"),
+                "email": f"{first}.{last}.{index}@{domain}".lower(),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from flask import current_app, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.extensions import db
+
+
+def _apply_route_statement_timeout(session, transaction, connection):
+    """SET LOCAL the per-route statement_timeout at the start of each transaction."""
+    if not has_request_context() or connection.dialect.name != "postgresql":
+        return
+    timeouts = current_app.config.get("DB_ROUTE_STATEMENT_TIMEOUTS_MS") or {}
+    timeout_ms = timeouts.get(request.endpoint)
+    if timeout_ms:
+        # SET does not accept bind parameters, value is an int from config
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def register_statement_timeouts():
+    """Hook the per-route timeouts once per process (create_app may run many times in tests)."""
+    if not event.contains(Session, "after_begin", _apply_route_statement_timeout):
+        event.listen(Session, "after_begin", _apply_route_statement_timeout)
+
+
+def register_read_commits(app):
+    """
+    End clean read transactions with COMMIT instead of ROLLBACK on psycopg (3).
+
+    psycopg forgets every prepared statement on ROLLBACK and sends a
+    DEALLOCATE ALL. The session rolls back whatever a request left open, so
+    without this GETs would never reuse a prepared statement and pay one more
+    round trip each.
+
+    Only GET/HEAD and DB_READ_ONLY_ENDPOINTS qualify: exc is None whenever
+    an error handler turned the exception into a response, so committing
+    after any request could persist a write that failed halfway.
+    """
+    driver = make_url(app.config["SQLALCHEMY_DATABASE_URI"]).get_driver_name()
+    if driver != "psycopg" or app.config.get("DB_PREPARE_THRESHOLD") is None:
+        return
+    read_only_endpoints = set(app.config.get("DB_READ_ONLY_ENDPOINTS", ()))
+
+    @app.teardown_request
+    def commit_read_transaction(exc):
+        if exc is not None or not db.session.registry.has():
+            return
+        if request.method not in ("GET", "HEAD") and request.endpoint not in read_only_endpoints:
+            return
+        session = db.session()
+        # Writes commit or roll back in the service layer, pending ORM changes are left to the rollback
+        if not session.in_transaction() or session.new or session.dirty or session.deleted:
+            return
+        try:
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+
+
+@contextmanager
+def pipeline(session):
+    """
+    psycopg 3 pipeline mode on the session's connection, a no-op on other drivers.
+
+    Statements inside the block go out without waiting for each other's
+    results: one round trip instead of one per statement. Errors surface at
+    the end of the block at the latest, only use it for statements whose
+    results (rowcount included) are not read inside it.
+    """
+    connection = session.connection()
+    if connection.dialect.driver != "psycopg":
+        yield
+        return
+    with connection.connection.driver_connection.pipeline():
+        yield
@@ -0,0 +1,51 @@
+import json
+import sys
+import urllib.request
+
+
+class StreamSink:
+    """Write events as JSON lines to stdout or an append-only file."""
+
+    def __init__(self, path=None):
+        self.path = path
+
+    def send(self, events):
+        lines = "".join(json.dumps(event) + "\n" for event in events)
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(lines)
+                fh.flush()
+        else:
+            sys.stdout.write(lines)
+            sys.stdout.flush()
+
+
+class WebhookSink:
+    """POST a batch of events as {"events": [...]} and expect a 2xx."""
+
+    def __init__(self, url, timeout=5.0, headers=None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def send(self, events):
+        body = json.dumps({"events": events}).encode("utf-8")
+        req = urllib.request.Request(self.url, data=body, headers=self.headers, method="POST")
+        # urlopen raises HTTPError on 4xx/5xx, the batch is then retried
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            resp.read()
+
+
+def build_sink(target, timeout=5.0):
+    """
+    "stdout"             -> JSON lines on stdout
+    "file:/path/x.jsonl" -> JSON lines appended to a file
+    "http(s)://..."      -> webhook
+    """
+    if not target or target == "stdout":
+        return StreamSink()
+    if target.startswith("file:"):
+        return StreamSink(target[len("file:"):])
+    if target.startswith(("http://", "https://")):
+        return WebhookSink(target, timeout=timeout)
+    raise ValueError(f"Unknown outbox sink: {target}")
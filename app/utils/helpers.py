@@ -7,4 +7,13 @@ def format_response(data=None, message=None, status="success"):
         response["message"] = message
     if data is not None:
         response["data"] = data
-    return response
\ No newline at end of file
+    return response
+
+
+def normalize_email(email):
+    """
+    Canonical form stored and compared for emails (trimmed, lower-cased).
+    """
+    if not isinstance(email, str):
+        return email
+    return email.strip().lower()
@@ -0,0 +1,71 @@
+"""
+Bandwidth / CPU trade-off of the response compression settings.
+
+Builds the same JSON body GET /api/v1/students returns and times each
+encoder on it. br/zstd rows are skipped when brotli/zstandard are missing.
+
+    python benchmarks/compression_bench.py --rows 100 1000 10000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.compression import available_encodings, compress_bytes
+from app.utils.helpers import format_response
+
+SETTINGS = [
+    ("gzip", {"COMPRESS_LEVEL": 1}),
+    ("gzip", {"COMPRESS_LEVEL": 6}),
+    ("gzip", {"COMPRESS_LEVEL": 9}),
+    ("br", {"COMPRESS_BR_QUALITY": 4}),
+    ("br", {"COMPRESS_BR_QUALITY": 11}),
+    ("zstd", {"COMPRESS_ZSTD_LEVEL": 3}),
+    ("zstd", {"COMPRESS_ZSTD_LEVEL": 9}),
+]
+
+
+def build_payload(rows):
+    students = [
+        {"id": i, "name": f"Student {i}", "email": f"student{i}@example.com"}
+        for i in range(1, rows + 1)
+    ]
+    body = format_response(data=students, message="All students retrieved")
+    return json.dumps(body).encode("utf-8")
+
+
+def bench(data, encoding, config, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = compress_bytes(data, encoding, config)
+    elapsed = (time.perf_counter() - start) / repeat
+    return len(out), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    installed = available_encodings(["gzip", "br", "zstd"])
+    print("| rows | raw bytes | encoding | setting | compressed bytes | ratio | CPU ms/response | MB/s |")
+    print("| ---- | --------- | -------- | ------- | ---------------- | ----- | --------------- | ---- |")
+    for rows in args.rows:
+        data = build_payload(rows)
+        for encoding, config in SETTINGS:
+            if encoding not in installed:
+                continue
+            size, elapsed = bench(data, encoding, config, args.repeat)
+            setting = ", ".join(f"{k.split('_')[-1].lower()}={v}" for k, v in config.items())
+            print(
+                f"| {rows} | {len(data)} | {encoding} | {setting} | {size} | "
+                f"{len(data) / size:.1f}x | {elapsed * 1000:.3f} | {len(data) / elapsed / 1e6:.0f} |"
+            )
+
+
+if __name__ == "__main__":
+    main()
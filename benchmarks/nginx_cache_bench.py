@@ -0,0 +1,107 @@
+"""
+Read load nginx takes off the Gunicorn workers with the micro-cache profile.
+
+Hammers GET /api/v1/students/<id> (skewed towards a hot set of ids, like
+real traffic) and GET /api/v1/students through nginx. Each response's
+X-Cache-Status tells whether Gunicorn served it. Run it once per nginx
+profile, against a seeded database:
+
+    make bench-nginx
+    # or by hand
+    NGINX_PROFILE=nginx.microcache.conf docker compose -f docker-compose.baremetal.yml up -d --build
+    docker compose -f docker-compose.baremetal.yml exec backend-1 flask students seed --count 10000
+    python benchmarks/nginx_cache_bench.py --url http://localhost:8080 --duration 30 --concurrency 32
+"""
+import argparse
+import http.client
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+# Requests that reached Gunicorn ("-" = not a cached location / plain nginx.conf). STALE
+# answered from the old copy but started the background refresh (or upstream just failed),
+# so it still costs one upstream request; UPDATING rode on a refresh already in flight
+UPSTREAM_STATUSES = {"MISS", "EXPIRED", "BYPASS", "STALE", "-"}
+
+
+def pick_path(rng, ids, hot_ids, list_ratio):
+    if rng.random() < list_ratio:
+        return "/api/v1/students"
+    # 80% of reads go to 20% of the ids
+    if rng.random() < 0.8:
+        return f"/api/v1/students/{rng.randint(1, hot_ids)}"
+    return f"/api/v1/students/{rng.randint(1, ids)}"
+
+
+def worker(url, deadline, seed, args, results, lock):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=10)
+    latencies, statuses, cache = [], Counter(), Counter()
+    while time.perf_counter() < deadline:
+        path = pick_path(rng, args.ids, max(1, args.ids // 5), args.list_ratio)
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers={"Accept-Encoding": "gzip"})
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            statuses["error"] += 1
+            conn.close()
+            time.sleep(0.01)
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] += 1
+        cache[response.getheader("X-Cache-Status", "-")] += 1
+    conn.close()
+    with lock:
+        results["latencies"].extend(latencies)
+        results["statuses"].update(statuses)
+        results["cache"].update(cache)
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000 if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--ids", type=int, default=10000, help="Student ids to spread reads over")
+    parser.add_argument("--list-ratio", type=float, default=0.05, help="Share of GET /students requests")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    results = {"latencies": [], "statuses": Counter(), "cache": Counter()}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(url, deadline, seed, args, results, lock))
+        for seed in range(args.concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(results["latencies"])
+    total = len(latencies)
+    upstream = sum(count for status, count in results["cache"].items() if status in UPSTREAM_STATUSES)
+    print(f"requests: {total} in {elapsed:.1f}s ({total / elapsed:.0f} req/s), statuses: {dict(results['statuses'])}")
+    print(f"cache: {dict(results['cache'])}")
+    print("| req/s | p50 ms | p99 ms | reached Gunicorn | upstream req/s | offloaded |")
+    print("| ----- | ------ | ------ | ---------------- | -------------- | --------- |")
+    print(
+        f"| {total / elapsed:.0f} | {percentile(latencies, 0.5):.2f} | {percentile(latencies, 0.99):.2f} "
+        f"| {upstream} | {upstream / elapsed:.0f} | {1 - upstream / total if total else 0:.1%} |"
+    )
+
+
+if __name__ == "__main__":
+    main()
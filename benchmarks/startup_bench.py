@@ -0,0 +1,78 @@
+"""
+Cold start benchmark: import time, create_app() time and first-request latency.
+
+Every run happens in a fresh interpreter, like a new Gunicorn worker or pod.
+
+    python benchmarks/startup_bench.py --runs 10
+    python benchmarks/startup_bench.py --max-total-ms 800   # exit 1 on regression
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from app import create_app
+from app.extensions import db
+t1 = time.perf_counter()
+app = create_app("testing")
+t2 = time.perf_counter()
+with app.app_context():
+    db.create_all()
+client = app.test_client()
+t3 = time.perf_counter()
+client.get("/healthcheck")
+t4 = time.perf_counter()
+client.get("/api/v1/students")
+t5 = time.perf_counter()
+heavy = ["flask_migrate", "alembic", "marshmallow_sqlalchemy"]
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "create_app_ms": (t2 - t1) * 1000,
+    "first_healthcheck_ms": (t4 - t3) * 1000,
+    "first_list_ms": (t5 - t4) * 1000,
+    "total_ms": (t5 - t0) * 1000 - (t3 - t2) * 1000,
+    "loaded": [m for m in heavy if m in sys.modules],
+}))
+"""
+
+
+def run_once():
+    env = dict(os.environ, PYTHONPATH=ROOT, LOG_LEVEL="WARNING")
+    env.pop("FLASK_RUN_FROM_CLI", None)
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-total-ms", type=float, help="fail if the median total exceeds this")
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    keys = ["import_ms", "create_app_ms", "first_healthcheck_ms", "first_list_ms", "total_ms"]
+    print("| metric | median ms | min ms | max ms |")
+    print("| ------ | --------- | ------ | ------ |")
+    for key in keys:
+        values = [r[key] for r in results]
+        print(f"| {key} | {statistics.median(values):.1f} | {min(values):.1f} | {max(values):.1f} |")
+    print(f"heavy modules loaded while serving: {results[0]['loaded'] or 'none'}")
+
+    if args.max_total_ms is not None:
+        median_total = statistics.median(r["total_ms"] for r in results)
+        if median_total > args.max_total_ms:
+            print(f"FAIL: median total {median_total:.1f} ms > {args.max_total_ms} ms")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,175 @@ class Config:
     DEBUG = False
     TESTING = False
     AUTO_CREATE_TABLES = False
-    SQLALCHEMY_DATABASE_URI = build_db_uri()
+    # psycopg2, or psycopg (3) for server-side prepared statements and pipeline mode
+    DB_DRIVER = os.environ.get("DB_DRIVER", "psycopg2")
+    SQLALCHEMY_DATABASE_URI = build_db_uri(DB_DRIVER)
+    # Flask-Migrate is always loaded under the flask CLI, force it elsewhere
+    MIGRATIONS_ENABLED = os.environ.get("MIGRATIONS_ENABLED", "false").lower() == "true"
+
+    # DB timeouts: a slow query or a dead DB must not pin a worker
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "5000"))
+    DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "3"))
+    DB_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", "5"))
+    # psycopg only: prepare a statement server-side after it ran this many times on a connection,
+    # "none" turns it off (PgBouncer transaction pooling before 1.21)
+    DB_PREPARE_THRESHOLD = os.environ.get("DB_PREPARE_THRESHOLD", "5")
+    DB_PREPARE_THRESHOLD = None if DB_PREPARE_THRESHOLD.lower() == "none" else int(DB_PREPARE_THRESHOLD)
+    # psycopg: besides GET/HEAD, endpoints whose transaction is ended with COMMIT (keeps prepared
+    # statements) instead of ROLLBACK. Only list routes that never write.
+    DB_READ_ONLY_ENDPOINTS = ["students.batch_get_students"]
+    # Compiled SQL per statement shape: the routes use under 10, CLI commands a few more
+    DB_QUERY_CACHE_SIZE = int(os.environ.get("DB_QUERY_CACHE_SIZE", "100"))
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_pre_ping": True,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "query_cache_size": DB_QUERY_CACHE_SIZE,
+        "connect_args": {
+            "connect_timeout": DB_CONNECT_TIMEOUT,
+            "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}",
+            **({"prepare_threshold": DB_PREPARE_THRESHOLD} if DB_DRIVER == "psycopg" else {}),
+        },
+    }
+    # Per-route overrides keyed by endpoint name, applied with SET LOCAL on Postgres
+    DB_ROUTE_STATEMENT_TIMEOUTS_MS = {
+        "students.get_students": int(os.environ.get("DB_LIST_STATEMENT_TIMEOUT_MS", "10000")),
+        "students.get_student": int(os.environ.get("DB_READ_STATEMENT_TIMEOUT_MS", "1000")),
+        "students.batch_get_students": int(os.environ.get("DB_READ_STATEMENT_TIMEOUT_MS", "1000")),
+    }
+
+    # Circuit breaker around the service layer
+    DB_BREAKER_ENABLED = os.environ.get("DB_BREAKER_ENABLED", "true").lower() == "true"
+    DB_BREAKER_FAILURE_THRESHOLD = int(os.environ.get("DB_BREAKER_FAILURE_THRESHOLD", "5"))
+    DB_BREAKER_RESET_TIMEOUT = float(os.environ.get("DB_BREAKER_RESET_TIMEOUT", "30"))
+
+    # Readiness: background SELECT 1 every interval, probes read the cached result
+    HEALTH_CHECK_INTERVAL = float(os.environ.get("HEALTH_CHECK_INTERVAL", "5"))
+    HEALTH_CHECK_MAX_AGE = float(os.environ.get("HEALTH_CHECK_MAX_AGE", "15"))
+
+    # Sampling profiler (opt-in), stacks served on /debug/profile
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0.01"))
+    PROFILING_INTERVAL_MS = int(os.environ.get("PROFILING_INTERVAL_MS", "5"))
+    PROFILING_MAX_STACKS = int(os.environ.get("PROFILING_MAX_STACKS", "50"))
+    PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN")
+
+    # Latency histograms and SLOs per route class, endpoints not listed fall in "default"
+    METRICS_ROUTE_CLASSES = {
+        "students.get_student": "read",
+        "students.batch_get_students": "read",
+        "students.get_students": "list",
+        "students.add_student": "write",
+        "students.update_student": "write",
+        "students.delete_student": "write",
+    }
+    METRICS_BUCKETS = {
+        "read": [float(b) for b in os.environ.get(
+            "METRICS_BUCKETS_READ", "0.001,0.0025,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1").split(",")],
+        "list": [float(b) for b in os.environ.get(
+            "METRICS_BUCKETS_LIST", "0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5").split(",")],
+        "write": [float(b) for b in os.environ.get(
+            "METRICS_BUCKETS_WRITE", "0.0025,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5").split(",")],
+        "default": [float(b) for b in os.environ.get(
+            "METRICS_BUCKETS_DEFAULT", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5").split(",")],
+    }
+    # A request is good when it answers below 500 within `latency` seconds
+    SLO_TARGETS = {
+        "read": {"latency": float(os.environ.get("SLO_READ_LATENCY", "0.1")),
+                 "objective": float(os.environ.get("SLO_READ_OBJECTIVE", "0.99"))},
+        "list": {"latency": float(os.environ.get("SLO_LIST_LATENCY", "0.5")),
+                 "objective": float(os.environ.get("SLO_LIST_OBJECTIVE", "0.99"))},
+        "write": {"latency": float(os.environ.get("SLO_WRITE_LATENCY", "0.25")),
+                  "objective": float(os.environ.get("SLO_WRITE_OBJECTIVE", "0.99"))},
+        "default": {"latency": float(os.environ.get("SLO_DEFAULT_LATENCY", "1")),
+                    "objective": float(os.environ.get("SLO_DEFAULT_OBJECTIVE", "0.99"))},
+    }
+    # Recent latencies kept per route for /debug/latency (same token as /debug/profile)
+    LATENCY_QUANTILES_WINDOW = int(os.environ.get("LATENCY_QUANTILES_WINDOW", "1024"))
+
+    # Request ids (X-Request-ID from nginx is kept when well-formed) and opt-in tracing spans
+    REQUEST_ID_TRUST_INCOMING = os.environ.get("REQUEST_ID_TRUST_INCOMING", "true").lower() == "true"
+    TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "false").lower() == "true"
+    TRACING_EXPORTER = os.environ.get("TRACING_EXPORTER", "file:/tmp/spans.jsonl")
+    TRACING_SERVICE_NAME = os.environ.get("TRACING_SERVICE_NAME", "student-api")
+    TRACING_SAMPLE_RATE = float(os.environ.get("TRACING_SAMPLE_RATE", "1.0"))
+    TRACING_BATCH_SIZE = int(os.environ.get("TRACING_BATCH_SIZE", "256"))
+    TRACING_MAX_QUEUE_SIZE = int(os.environ.get("TRACING_MAX_QUEUE_SIZE", "2048"))
+    TRACING_EXPORT_INTERVAL = float(os.environ.get("TRACING_EXPORT_INTERVAL", "2"))
+
+    # Memory diagnostics: RSS gauge always, tracemalloc diffs on /debug/memory (same token as /debug/profile)
+    MEMORY_DIAGNOSTICS_ENABLED = os.environ.get("MEMORY_DIAGNOSTICS_ENABLED", "true").lower() == "true"
+    MEMORY_TRACEMALLOC_ENABLED = os.environ.get("MEMORY_TRACEMALLOC_ENABLED", "false").lower() == "true"
+    MEMORY_TRACEMALLOC_FRAMES = int(os.environ.get("MEMORY_TRACEMALLOC_FRAMES", "1"))
+    MEMORY_RSS_INTERVAL = float(os.environ.get("MEMORY_RSS_INTERVAL", "5"))
+
+    # SQL instrumentation: per-request query count/time, slow query log, Server-Timing
+    SQL_INSTRUMENTATION_ENABLED = os.environ.get("SQL_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+    SQL_SLOW_QUERY_MS = float(os.environ.get("SQL_SLOW_QUERY_MS", "200"))
+    SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+    # Response compression (br/zstd only if brotli/zstandard are installed)
+    COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "true").lower() == "true"
+    COMPRESS_ALGORITHMS = os.environ.get("COMPRESS_ALGORITHMS", "zstd,br,gzip")
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", "1"))
+    COMPRESS_BR_QUALITY = int(os.environ.get("COMPRESS_BR_QUALITY", "4"))
+    COMPRESS_ZSTD_LEVEL = int(os.environ.get("COMPRESS_ZSTD_LEVEL", "3"))
+
+    # Cache-Control on successful GETs, keyed by endpoint name (nginx micro-cache honours it)
+    HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE_ENABLED", "true").lower() == "true"
+    HTTP_CACHE_CONTROL = {
+        "students.get_student": os.environ.get(
+            "HTTP_CACHE_CONTROL_ITEM", "public, max-age=2, stale-while-revalidate=10"),
+        "students.get_students": os.environ.get(
+            "HTTP_CACHE_CONTROL_LIST", "public, max-age=1, stale-while-revalidate=5"),
+    }
+    HTTP_CACHE_WRITE_CONTROL = os.environ.get("HTTP_CACHE_WRITE_CONTROL", "no-store")
+    HTTP_CACHE_VARY = os.environ.get("HTTP_CACHE_VARY", "Accept-Encoding")
+
+    # Idempotency-Key replay store: "database" (idempotency_keys table) or "redis"
+    IDEMPOTENCY_ENABLED = os.environ.get("IDEMPOTENCY_ENABLED", "true").lower() == "true"
+    IDEMPOTENCY_BACKEND = os.environ.get("IDEMPOTENCY_BACKEND", "database")
+    IDEMPOTENCY_REDIS_URL = os.environ.get("IDEMPOTENCY_REDIS_URL", "redis://localhost:6379/0")
+    IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", "86400"))
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.environ.get("IDEMPOTENCY_LOCK_TIMEOUT", "30"))
+
+    # Token-bucket rate limiting per client (API key, else X-Real-IP) on the student API
+    # Limits are "N/s", "N/m" or "N/h" with an optional ":burst", keyed by endpoint name
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")  # memory, shm or redis
+    RATE_LIMIT_REDIS_URL = os.environ.get("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/1")
+    RATE_LIMIT_SHM_PATH = os.environ.get("RATE_LIMIT_SHM_PATH", "/dev/shm/student-api-ratelimit")
+    RATE_LIMIT_SHM_SLOTS = int(os.environ.get("RATE_LIMIT_SHM_SLOTS", "65536"))
+    RATE_LIMIT_API_KEY_HEADER = os.environ.get("RATE_LIMIT_API_KEY_HEADER", "X-API-Key")
+    # Keys that get a bucket of their own, any other (or no) key is limited by client IP
+    RATE_LIMIT_API_KEYS = [k.strip() for k in os.environ.get("RATE_LIMIT_API_KEYS", "").split(",") if k.strip()]
+    RATE_LIMIT_TRUST_PROXY = os.environ.get("RATE_LIMIT_TRUST_PROXY", "true").lower() == "true"
+    RATE_LIMITS = {
+        "default": os.environ.get("RATE_LIMIT_DEFAULT", "50/s:100"),
+        "students.get_students": os.environ.get("RATE_LIMIT_LIST", "5/s:10"),
+        "students.batch_get_students": os.environ.get("RATE_LIMIT_BATCH_GET", "10/s:20"),
+        "students.add_student": os.environ.get("RATE_LIMIT_WRITE", "10/s:20"),
+        "students.update_student": os.environ.get("RATE_LIMIT_WRITE", "10/s:20"),
+        "students.delete_student": os.environ.get("RATE_LIMIT_WRITE", "10/s:20"),
+    }
+
+    # Transactional outbox dispatcher (`flask outbox dispatch`)
+    OUTBOX_SINK = os.environ.get("OUTBOX_SINK", "stdout")
+    OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", "100"))
+    OUTBOX_POLL_INTERVAL = float(os.environ.get("OUTBOX_POLL_INTERVAL", "1"))
+    OUTBOX_WEBHOOK_TIMEOUT = float(os.environ.get("OUTBOX_WEBHOOK_TIMEOUT", "5"))
+
+    # Max ids per POST /api/v1/students/batch-get (one IN query)
+    STUDENT_BATCH_GET_MAX_IDS = int(os.environ.get("STUDENT_BATCH_GET_MAX_IDS", "100"))
+
+    # `flask students archive`: move students not updated for N days to students_archive
+    STUDENT_ARCHIVE_AFTER_DAYS = float(os.environ.get("STUDENT_ARCHIVE_AFTER_DAYS", "730"))
+    STUDENT_ARCHIVE_BATCH_SIZE = int(os.environ.get("STUDENT_ARCHIVE_BATCH_SIZE", "1000"))
+    STUDENT_ARCHIVE_PAUSE = float(os.environ.get("STUDENT_ARCHIVE_PAUSE", "0.1"))
+
+    # `flask students purge`: physically remove soft-deleted students after a grace period
+    STUDENT_PURGE_AFTER_HOURS = float(os.environ.get("STUDENT_PURGE_AFTER_HOURS", "720"))
+    STUDENT_PURGE_BATCH_SIZE = int(os.environ.get("STUDENT_PURGE_BATCH_SIZE", "1000"))
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -30,6 +198,9 @@ class StagingConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    # Every test shares one client address, tests enable it explicitly
+    RATE_LIMIT_ENABLED = False
     # SECRET_KEY = "test-secret-key"
 
 class ProductionConfig(Config):
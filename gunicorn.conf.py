@@ -18,6 +18,24 @@ errorlog = os.getenv("ERROR_LOG", "-")
 # Make sure Gunicorn captures stdout/stderr from app logs
 capture_output = True
 
+# Seconds a worker gets to finish in-flight requests after SIGTERM before it is killed
+# keep below the pod's terminationGracePeriodSeconds / compose stop_grace_period
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+# Sync workers close every connection; gthread keeps nginx's upstream keepalive pool open
+# (keepalive must outlive nginx's keepalive_timeout so nginx is the side that closes)
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Restart a worker once its RSS passes this (MiB, 0 = off), checked every N requests.
+# Size it below the container limit / workers so the OOM-killer never gets there first.
+max_worker_rss_mb = int(os.getenv("GUNICORN_MAX_WORKER_RSS_MB", "0"))
+rss_check_interval = int(os.getenv("GUNICORN_RSS_CHECK_INTERVAL", "50"))
+# Count-based recycling as a backstop (0 = off), jitter avoids all workers restarting together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
 # Using JSON formatting for both access and error logs no need of env var fixed
 json_logging = os.getenv("JSON_LOGS", "true").lower() == "true"
 
@@ -75,6 +93,67 @@ def on_starting(server):
 
 
 
+#   LIFECYCLE HOOKS: drain workers on rolling deploys
+
+def post_worker_init(worker):
+    """Flip readiness to 503 the moment the worker is told to stop (SIGTERM)."""
+    import signal
+    from app.lifecycle import lifecycle
+
+    handle_exit = worker.handle_exit
+
+    def drain_then_exit(sig, frame):
+        lifecycle.begin_draining("SIGTERM")
+        handle_exit(sig, frame)
+
+    signal.signal(signal.SIGTERM, drain_then_exit)
+
+    # kill -USR2 <worker pid> logs a tracemalloc diff (needs MEMORY_TRACEMALLOC_ENABLED or /debug/memory?start=true)
+    if os.getenv("MEMORY_SNAPSHOT_SIGNAL", "true").lower() == "true":
+        from app.memory import install_snapshot_signal
+        install_snapshot_signal(signal.SIGUSR2)
+
+
+def post_request(worker, req, environ, resp):
+    """Recycle the worker gracefully once it grows past max_worker_rss_mb."""
+    if not max_worker_rss_mb or not worker.alive:
+        return
+    worker.rss_checks = getattr(worker, "rss_checks", 0) + 1
+    if worker.rss_checks % rss_check_interval:
+        return
+
+    from app.lifecycle import lifecycle
+    from app.memory import should_recycle
+    if should_recycle(max_worker_rss_mb * 2**20):
+        # Finish what's in flight, then the arbiter forks a fresh worker (like max_requests)
+        lifecycle.begin_draining("RSS limit")
+        worker.alive = False
+
+
+def worker_int(worker):
+    """SIGINT/SIGQUIT (fast shutdown): still stop advertising readiness first."""
+    from app.lifecycle import lifecycle
+    lifecycle.begin_draining("SIGINT")
+
+
+def child_exit(server, worker):
+    """Runs in the master: drop the dead worker's live* gauge files (RSS, breaker, readiness)."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    """Dispose the SQLAlchemy pool and flush logs once the worker has stopped serving."""
+    from app.lifecycle import lifecycle
+
+    app = getattr(worker, "wsgi", None)
+    if app is None or not hasattr(app, "app_context"):
+        return
+    lifecycle.shutdown(app)
+
+
+
 # ACCESS LOG FORMAT
 # Keep access logs minimal for Loki ingestion
 # Example JSON:
@@ -82,7 +161,8 @@ def on_starting(server):
 # Bad printing JSON
 access_log_format = (
     '{"client":"%(h)s","user":"%(u)s","method":"%(m)s","path":"%(U)s","query":"%(q)s",'
-    '"status":%(s)s,"size":%(B)s,"referer":"%(f)s","agent":"%(a)s","request_time":%(L)s}'
+    '"status":%(s)s,"size":%(B)s,"referer":"%(f)s","agent":"%(a)s","request_time":%(L)s,'
+    '"request_id":"%({x-request-id}o)s"}'
 )
 
 # access_log_format = (
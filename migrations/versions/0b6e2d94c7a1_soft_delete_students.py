@@ -0,0 +1,90 @@
+"""Soft delete for students: deleted_at and partial indexes on live rows
+
+Revision ID: 0b6e2d94c7a1
+Revises: f41c9a7d2b83
+Create Date: 2026-10-19 14:02:11.734512
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6e2d94c7a1'
+down_revision = 'f41c9a7d2b83'
+branch_labels = None
+depends_on = None
+
+LIVE = sa.text('deleted_at IS NULL')
+DELETED = sa.text('deleted_at IS NOT NULL')
+
+# Names SQLite batch mode gives the initial migration's unnamed UNIQUE(email)
+SQLITE_NAMING = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def _drop_invalid_index(name):
+    # Left behind by an interrupted concurrent build (see e3b8d1f05a62)
+    if context.is_offline_mode():
+        return
+    valid = op.get_bind().execute(
+        sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    ).scalar()
+    if valid is False:
+        op.drop_index(name, table_name='students', postgresql_concurrently=True, if_exists=True)
+
+
+def _create_indexes(concurrently):
+    kw = {'postgresql_concurrently': True, 'if_not_exists': True} if concurrently else {}
+    if concurrently:
+        for name in ('uq_students_email_lower_live', 'ix_students_live_id', 'ix_students_deleted_at'):
+            _drop_invalid_index(name)
+    op.create_index('uq_students_email_lower_live', 'students', [sa.text('lower(email)')], unique=True,
+                    postgresql_where=LIVE, sqlite_where=LIVE, **kw)
+    op.create_index('ix_students_live_id', 'students', ['id'], unique=False,
+                    postgresql_where=LIVE, sqlite_where=LIVE, **kw)
+    op.create_index('ix_students_deleted_at', 'students', ['deleted_at'], unique=False,
+                    postgresql_where=DELETED, sqlite_where=DELETED, **kw)
+
+
+def upgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    # Nullable, no default: metadata-only on Postgres, no table rewrite. Committed before the
+    # concurrent index builds, so a retry after one of them failed finds the column (SQLite has
+    # no ADD COLUMN IF NOT EXISTS, and runs the whole upgrade in one transaction anyway)
+    op.add_column('students', sa.Column('deleted_at', sa.DateTime(), nullable=True), if_not_exists=postgres or None)
+
+    if postgres:
+        # New indexes first so email uniqueness is never unenforced, none of them block writes
+        with op.get_context().autocommit_block():
+            _create_indexes(concurrently=True)
+            op.drop_index('uq_students_email_lower', table_name='students', postgresql_concurrently=True,
+                          if_exists=True)
+        # A deleted student's email can be registered again
+        op.drop_constraint('students_email_key', 'students', type_='unique')
+    else:
+        # Batch mode recreates the table and can't carry expression indexes over: rebuild them after
+        with op.batch_alter_table('students', naming_convention=SQLITE_NAMING) as batch_op:
+            batch_op.drop_constraint('uq_students_email', type_='unique')
+        op.drop_index('uq_students_email_lower', table_name='students', if_exists=True)
+        _create_indexes(concurrently=False)
+
+
+def downgrade():
+    # Fails while a live student shares an email with a tombstone: purge first
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_unique_constraint('students_email_key', 'students', ['email'])
+        with op.get_context().autocommit_block():
+            _drop_invalid_index('uq_students_email_lower')
+            op.create_index('uq_students_email_lower', 'students', [sa.text('lower(email)')], unique=True,
+                            postgresql_concurrently=True, if_not_exists=True)
+            for name in ('ix_students_deleted_at', 'ix_students_live_id', 'uq_students_email_lower_live'):
+                op.drop_index(name, table_name='students', postgresql_concurrently=True, if_exists=True)
+    else:
+        for name in ('ix_students_deleted_at', 'ix_students_live_id', 'uq_students_email_lower_live'):
+            op.drop_index(name, table_name='students', if_exists=True)
+        with op.batch_alter_table('students', naming_convention=SQLITE_NAMING) as batch_op:
+            batch_op.create_unique_constraint('uq_students_email', ['email'])
+        op.create_index('uq_students_email_lower', 'students', [sa.text('lower(email)')], unique=True,
+                        if_not_exists=True)
+
+    op.drop_column('students', 'deleted_at')
@@ -0,0 +1,38 @@
+"""Add outbox_events table for student change events
+
+Revision ID: c7577d1ac5e7
+Revises: a2c92c74d27c
+Create Date: 2026-10-19 11:03:17.402951
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7577d1ac5e7'
+down_revision = 'a2c92c74d27c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbox_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('aggregate_id', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('dispatched_at', sa.DateTime(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Partial index: only undelivered rows (Postgres, plain index elsewhere)
+    op.create_index('ix_outbox_events_pending', 'outbox_events', ['id'], unique=False,
+                    postgresql_where=sa.text('dispatched_at IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_outbox_events_pending', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,63 @@
+"""Case-insensitive unique index on students.email
+
+Revision ID: e3b8d1f05a62
+Revises: c7577d1ac5e7
+Create Date: 2026-10-19 11:48:05.207316
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b8d1f05a62'
+down_revision = 'c7577d1ac5e7'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'uq_students_email_lower'
+
+
+def _drop_invalid_index(name):
+    # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind that
+    # if_not_exists would then keep: drop it so this run builds it again
+    if context.is_offline_mode():
+        return
+    valid = op.get_bind().execute(
+        sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    ).scalar()
+    if valid is False:
+        op.drop_index(name, table_name='students', postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not context.is_offline_mode():
+        duplicates = bind.execute(sa.text(
+            "SELECT lower(trim(email)) FROM students GROUP BY lower(trim(email)) HAVING count(*) > 1"
+        )).scalars().all()
+    else:
+        duplicates = []
+    if duplicates:
+        raise RuntimeError(
+            f"Cannot add {INDEX_NAME}: emails differing only by case/whitespace must be merged first: {duplicates}"
+        )
+
+    op.execute("UPDATE students SET email = lower(trim(email)) WHERE email <> lower(trim(email))")
+
+    if bind.dialect.name == 'postgresql':
+        # CONCURRENTLY can't run inside a transaction; doesn't block writes on the live table
+        with op.get_context().autocommit_block():
+            _drop_invalid_index(INDEX_NAME)
+            op.create_index(INDEX_NAME, 'students', [sa.text('lower(email)')], unique=True,
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index(INDEX_NAME, 'students', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX_NAME, table_name='students', postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index(INDEX_NAME, table_name='students')
@@ -0,0 +1,63 @@
+"""Add students_archive table and updated_at index for archival
+
+Revision ID: f41c9a7d2b83
+Revises: e3b8d1f05a62
+Create Date: 2026-10-19 13:20:44.581930
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f41c9a7d2b83'
+down_revision = 'e3b8d1f05a62'
+branch_labels = None
+depends_on = None
+
+
+def _drop_invalid_index(name):
+    # Left behind by an interrupted concurrent build (see e3b8d1f05a62)
+    if context.is_offline_mode():
+        return
+    valid = op.get_bind().execute(
+        sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    ).scalar()
+    if valid is False:
+        op.drop_index(name, table_name='students', postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade():
+    op.create_table('students_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('age', sa.Integer(), nullable=False),
+    sa.Column('grade', sa.String(length=20), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    # Committed before the concurrent index build below, so a retry after it failed finds the table
+    if_not_exists=True
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Built without blocking writes on the live table
+        with op.get_context().autocommit_block():
+            _drop_invalid_index('ix_students_updated_at')
+            op.create_index('ix_students_updated_at', 'students', ['updated_at'], unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index('ix_students_updated_at', 'students', ['updated_at'], unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_students_updated_at', table_name='students', postgresql_concurrently=True,
+                          if_exists=True)
+    else:
+        op.drop_index('ix_students_updated_at', table_name='students')
+
+    op.drop_table('students_archive')
@@ -0,0 +1,55 @@
+import gzip
+from flask import Response
+from app.compression import choose_encoding
+
+
+def _add_students(client, count):
+    return [
+        client.post("/api/v1/students", json={
+            "name": "Student", "age": 10, "grade": "5th", "email": f"student{i}@example.com"
+        }).get_json()["data"]["id"]
+        for i in range(count)
+    ]
+
+
+def test_choose_encoding_honours_q_values():
+    available = ["br", "gzip"]
+    assert choose_encoding("gzip, br", available) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5", available) == "gzip"
+    assert choose_encoding("br;q=0, gzip", available) == "gzip"
+    assert choose_encoding("identity", available) is None
+    assert choose_encoding("*", available) == "br"
+
+
+def test_large_list_is_gzipped(client):
+    _add_students(client, 30)
+    res = client.get("/api/v1/students", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in res.headers["Vary"]
+    body = gzip.decompress(res.get_data())
+    assert b"student29@example.com" in body
+
+
+def test_small_response_is_not_compressed(client):
+    [student_id] = _add_students(client, 1)
+    res = client.get(f"/api/v1/students/{student_id}", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in res.headers
+    assert res.get_json()["data"]["id"] == student_id
+
+
+def test_no_accept_encoding_returns_identity(client):
+    _add_students(client, 30)
+    res = client.get("/api/v1/students")
+    assert "Content-Encoding" not in res.headers
+
+
+def test_streamed_response_is_compressed(app_factory):
+    app = app_factory()
+
+    @app.route("/test-export")
+    def export():
+        return Response((f"row-{i}\n" for i in range(1000)), mimetype="text/csv")
+
+    res = app.test_client().get("/test-export", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(res.get_data()).count(b"row-") == 1000
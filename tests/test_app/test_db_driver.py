@@ -0,0 +1,121 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import insert, select, text
+from app.extensions import db
+from app.models.student import Student
+from app.utils.custom_errors import NotFoundError
+from app.utils.db_helpers import pipeline
+from tests.conftest import TEST_DATABASE_URL
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+on_psycopg = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql+psycopg:"),
+    reason="needs TEST_DATABASE_URL=postgresql+psycopg://...",
+)
+
+
+def _config_for(extra_env):
+    code = (
+        "import json\n"
+        "from config import Config\n"
+        "print(json.dumps([Config.SQLALCHEMY_DATABASE_URI, Config.SQLALCHEMY_ENGINE_OPTIONS]))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    for name in ("DB_DRIVER", "DB_PREPARE_THRESHOLD", "DB_QUERY_CACHE_SIZE"):
+        env.pop(name, None)
+    env.update(extra_env)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_default_driver_is_psycopg2_without_prepare_threshold():
+    uri, options = _config_for({})
+    assert uri.startswith("postgresql+psycopg2://")
+    assert "prepare_threshold" not in options["connect_args"]
+    assert options["query_cache_size"] == 100
+
+
+def test_psycopg_driver_prepares_statements():
+    uri, options = _config_for({"DB_DRIVER": "psycopg"})
+    assert uri.startswith("postgresql+psycopg://")
+    assert options["connect_args"]["prepare_threshold"] == 5
+
+    _, options = _config_for({"DB_DRIVER": "psycopg", "DB_PREPARE_THRESHOLD": "none"})
+    assert options["connect_args"]["prepare_threshold"] is None
+
+
+def _cache_misses():
+    return REGISTRY.get_sample_value("db_compiled_cache_total", {"result": "miss"}) or 0
+
+
+def test_routes_reuse_compiled_statements(client):
+    def exercise(suffix):
+        created = client.post("/api/v1/students", json={
+            "name": "Cache Student", "age": 20, "grade": "A", "email": f"cache-{suffix}@example.com",
+        }).get_json()["data"]
+        student_id = created["id"]
+        client.get("/api/v1/students")
+        client.get(f"/api/v1/students?email=cache-{suffix}@example.com")
+        client.get(f"/api/v1/students/{student_id}")
+        client.post("/api/v1/students/batch-get", json={"ids": [student_id, student_id + 1000]})
+        client.patch(f"/api/v1/students/{student_id}", json={"grade": "B"})
+        client.delete(f"/api/v1/students/{student_id}")
+
+    exercise("first")
+    misses = _cache_misses()
+    exercise("second")
+
+    # Same statement shapes with new parameters: all served from the compiled cache
+    assert _cache_misses() == misses
+    assert REGISTRY.get_sample_value("db_compiled_cache_total", {"result": "hit"}) > 0
+
+
+def test_pipeline_runs_statements(session):
+    session.add_all([Student(name="Pipe One", age=20, grade="A", email="pipe1@example.com"),
+                     Student(name="Pipe Two", age=21, grade="B", email="pipe2@example.com")])
+    session.flush()
+
+    with pipeline(session):
+        session.execute(text("UPDATE students SET grade = 'C' WHERE email = 'pipe1@example.com'"))
+        session.execute(text("UPDATE students SET grade = 'D' WHERE email = 'pipe2@example.com'"))
+
+    grades = session.execute(select(Student.grade).where(Student.email.like("pipe%")).order_by(Student.email))
+    assert grades.scalars().all() == ["C", "D"]
+
+
+@on_psycopg
+def test_pipeline_mode_is_on_inside_block(session):
+    driver_connection = session.connection().connection.driver_connection
+    with pipeline(session):
+        assert driver_connection.pgconn.pipeline_status
+    assert not driver_connection.pgconn.pipeline_status
+
+
+@on_psycopg
+def test_prepared_statements_survive_requests(app_factory):
+    client = app_factory().test_client()
+    for _ in range(10):
+        client.get("/api/v1/students/1")
+
+    # Reads end with COMMIT: a ROLLBACK would have made psycopg deallocate everything
+    with db.engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM pg_prepared_statements")).scalar() > 0
+
+
+@on_psycopg
+def test_handled_error_after_write_is_not_committed(app_factory):
+    app = app_factory()
+
+    @app.route("/test-half-write", methods=["POST"])
+    def half_write():
+        db.session.execute(insert(Student).values(name="Half", age=20, grade="A", email="half@example.com"))
+        raise NotFoundError("gone")
+
+    assert app.test_client().post("/test-half-write").status_code == 404
+    with db.engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM students WHERE email = 'half@example.com'")).scalar() == 0
@@ -0,0 +1,19 @@
+import pytest
+from app.models.student import Student
+from app.services import student_service
+
+
+@pytest.mark.parametrize("run", [1, 2])
+def test_committed_writes_are_rolled_back_between_tests(session, run):
+    # Whichever run goes second would see the first one's row if isolation leaked
+    assert Student.query.count() == 0
+    student_service.create_student(Student(name="Iso", age=10, grade="5th", email="iso@example.com"))
+    assert Student.query.count() == 1
+
+
+def test_rollback_inside_test_keeps_earlier_writes(session):
+    student_service.create_student(Student(name="Kept", age=10, grade="5th", email="kept@example.com"))
+    with pytest.raises(Exception):
+        # Service rolls back to its SAVEPOINT only
+        student_service.create_student(Student(name="Kept", age=10, grade="5th", email="KEPT@example.com"))
+    assert Student.query.count() == 1
@@ -0,0 +1,43 @@
+import pytest
+from app import create_app
+from app.health import readiness
+
+
+# The readiness check opens its own connection: needs its own app
+@pytest.fixture
+def app(app_factory):
+    return app_factory()
+
+
+def test_liveness_route(client):
+    res = client.get("/healthcheck/live")
+    assert res.status_code == 200
+    assert res.get_json()["status"] == "ok"
+
+
+def test_readiness_route(client, max_queries):
+    res = client.get("/healthcheck/ready")
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["status"] == "ready"
+    assert data["database"] == "ok"
+
+    # Later probes read the cached result, no query on the request path
+    with max_queries(0):
+        assert client.get("/healthcheck/ready").status_code == 200
+
+
+def test_readiness_reports_db_down():
+    app = create_app("testing", test_config={
+        "SQLALCHEMY_DATABASE_URI": "sqlite:////nonexistent-dir/students.db",
+    })
+    res = app.test_client().get("/healthcheck/ready")
+    assert res.status_code == 503
+    assert res.get_json()["database"] == "unavailable"
+
+
+def test_readiness_not_ready_while_draining(client):
+    readiness.draining = True
+    res = client.get("/healthcheck/ready")
+    assert res.status_code == 503
+    assert res.get_json()["draining"] is True
@@ -0,0 +1,34 @@
+STUDENT = {"name": "Alice", "age": 10, "grade": "5th", "email": "alice@example.com"}
+
+
+def test_reads_are_cacheable(client):
+    created = client.post("/api/v1/students", json=STUDENT).get_json()["data"]
+
+    single = client.get(f"/api/v1/students/{created['id']}")
+    assert single.headers["Cache-Control"] == "public, max-age=2, stale-while-revalidate=10"
+    assert "Accept-Encoding" in single.headers["Vary"]
+
+    listing = client.get("/api/v1/students")
+    assert listing.headers["Cache-Control"] == "public, max-age=1, stale-while-revalidate=5"
+
+
+def test_writes_and_errors_are_not_stored(client):
+    created = client.post("/api/v1/students", json=STUDENT)
+    assert created.headers["Cache-Control"] == "no-store"
+    student_id = created.get_json()["data"]["id"]
+
+    assert client.patch(f"/api/v1/students/{student_id}", json={"age": 11}).headers["Cache-Control"] == "no-store"
+    assert client.post("/api/v1/students/batch-get", json={"ids": [student_id]}).headers["Cache-Control"] == "no-store"
+    assert client.delete(f"/api/v1/students/{student_id}").headers["Cache-Control"] == "no-store"
+    # A cached 404 would outlive the next create
+    assert client.get(f"/api/v1/students/{student_id}").headers["Cache-Control"] == "no-store"
+
+
+def test_probes_and_metrics_are_left_alone(client):
+    assert "Cache-Control" not in client.get("/healthcheck/live").headers
+    assert "Cache-Control" not in client.get("/metrics").headers
+
+
+def test_cache_headers_can_be_disabled(app_factory):
+    client = app_factory({"HTTP_CACHE_ENABLED": False}).test_client()
+    assert "Cache-Control" not in client.get("/api/v1/students").headers
@@ -0,0 +1,163 @@
+import time
+import pytest
+from app.idempotency import ACQUIRED, IN_PROGRESS, MISMATCH, REPLAY, RedisIdempotencyStore, store_key
+from app.models.student import Student
+
+STUDENT = {"name": "Alice", "age": 10, "grade": "5th", "email": "alice@example.com"}
+
+
+# The database store commits on its own connections: needs its own app
+@pytest.fixture
+def app(app_factory):
+    return app_factory()
+
+
+class FakeRedis:
+    """Just enough of the redis-py API for the store."""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, name, value, nx=False, ex=None):
+        expired = name in self.data and self.data[name][1] is not None and self.data[name][1] <= time.time()
+        if nx and name in self.data and not expired:
+            return None
+        self.data[name] = (value, time.time() + ex if ex else None)
+        return True
+
+    def get(self, name):
+        value = self.data.get(name)
+        if value is None or (value[1] is not None and value[1] <= time.time()):
+            return None
+        return value[0]
+
+    def delete(self, name):
+        self.data.pop(name, None)
+
+
+def test_retried_post_is_replayed(client):
+    headers = {"Idempotency-Key": "create-alice"}
+    first = client.post("/api/v1/students", json=STUDENT, headers=headers)
+    retry = client.post("/api/v1/students", json=STUDENT, headers=headers)
+
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.get_json() == first.get_json()
+    assert Student.query.count() == 1
+
+
+def test_same_key_different_payload_is_rejected(client):
+    headers = {"Idempotency-Key": "k1"}
+    client.post("/api/v1/students", json=STUDENT, headers=headers)
+    res = client.post("/api/v1/students", json={**STUDENT, "email": "other@example.com"}, headers=headers)
+    assert res.status_code == 422
+
+
+def test_concurrent_duplicate_gets_409(app, client):
+    store = app.extensions["idempotency"]
+    # Simulate the first request still running
+    store.acquire(store_key("ip:127.0.0.1", "students.add_student", "busy"), "some-fingerprint")
+    res = client.post("/api/v1/students", json=STUDENT, headers={"Idempotency-Key": "busy"})
+    assert res.status_code == 409
+    assert res.headers["Retry-After"] == "1"
+
+
+def _flaky_app(app_factory, **config):
+    """App with a POST route that raises on its first call and succeeds after."""
+    app = app_factory(config)
+    calls = []
+
+    @app.route("/api/v1/test-flaky", methods=["POST"])
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return {"calls": len(calls)}, 201
+
+    return app, calls
+
+
+def test_server_error_releases_key(app_factory):
+    app, calls = _flaky_app(app_factory, PROPAGATE_EXCEPTIONS=False)
+    client = app.test_client()
+    headers = {"Idempotency-Key": "k2"}
+
+    first = client.post("/api/v1/test-flaky", json={}, headers=headers)
+    retry = client.post("/api/v1/test-flaky", json={}, headers=headers)
+
+    assert first.status_code == 500
+    # Re-executed, not replayed and not stuck in progress
+    assert retry.status_code == 201
+    assert "Idempotent-Replayed" not in retry.headers
+    assert retry.get_json() == {"calls": 2}
+    assert len(calls) == 2
+
+
+def test_unhandled_exception_releases_key_on_teardown(app_factory):
+    app, calls = _flaky_app(app_factory, PROPAGATE_EXCEPTIONS=True)
+    client = app.test_client()
+    headers = {"Idempotency-Key": "k3"}
+
+    # The exception escapes before after_request: only teardown can release the key
+    with pytest.raises(RuntimeError):
+        client.post("/api/v1/test-flaky", json={}, headers=headers)
+    retry = client.post("/api/v1/test-flaky", json={}, headers=headers)
+
+    assert retry.status_code == 201
+    assert retry.get_json() == {"calls": 2}
+    assert app.extensions["idempotency"].acquire(store_key("ip:127.0.0.1", "flaky", "k3"), "other") == (MISMATCH, None)
+
+
+def test_failed_complete_leaves_key_to_teardown(app_factory, monkeypatch):
+    app, calls = _flaky_app(app_factory, PROPAGATE_EXCEPTIONS=False)
+    store = app.extensions["idempotency"]
+    client = app.test_client()
+    headers = {"Idempotency-Key": "k4"}
+    client.post("/api/v1/test-flaky", json={}, headers=headers)
+
+    def broken_complete(*args):
+        raise ConnectionError("store down")
+
+    monkeypatch.setattr(store, "complete", broken_complete)
+    assert client.post("/api/v1/test-flaky", json={}, headers=headers).status_code == 500
+    monkeypatch.undo()
+
+    # Released, not stuck in progress until the lock timeout
+    assert client.post("/api/v1/test-flaky", json={}, headers=headers).get_json() == {"calls": 3}
+
+
+def test_keys_are_scoped_to_client_and_route(client):
+    headers = {"Idempotency-Key": "shared-uuid"}
+    first = client.post("/api/v1/students", json=STUDENT, headers={**headers, "X-Real-IP": "10.0.0.1"})
+    other_client = client.post(
+        "/api/v1/students", json={**STUDENT, "email": "bob@example.com"}, headers={**headers, "X-Real-IP": "10.0.0.2"}
+    )
+    other_route = client.post(
+        "/api/v1/students/batch-get", json={"ids": [1]}, headers={**headers, "X-Real-IP": "10.0.0.1"}
+    )
+
+    assert first.status_code == 201
+    assert other_client.status_code == 201
+    assert "Idempotent-Replayed" not in other_client.headers
+    assert other_route.status_code == 200
+    assert Student.query.count() == 2
+
+
+def test_without_key_no_replay(client):
+    client.post("/api/v1/students", json=STUDENT)
+    res = client.post("/api/v1/students", json=STUDENT)
+    assert res.status_code == 409
+
+
+def test_redis_store_contract():
+    store = RedisIdempotencyStore(FakeRedis(), ttl=60, lock_timeout=5)
+    assert store.acquire("k", "fp") == (ACQUIRED, None)
+    assert store.acquire("k", "fp") == (IN_PROGRESS, None)
+
+    store.complete("k", 201, '{"ok": true}', "application/json")
+    assert store.acquire("k", "other") == (MISMATCH, None)
+    state, record = store.acquire("k", "fp")
+    assert state == REPLAY
+    assert record["status_code"] == 201
+    assert record["body"] == '{"ok": true}'
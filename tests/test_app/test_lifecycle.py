@@ -0,0 +1,68 @@
+import importlib.util
+import os
+import signal
+import sys
+import pytest
+from app.extensions import db
+from app.health import readiness
+from app.lifecycle import lifecycle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Disposes the pool: needs its own app
+@pytest.fixture
+def app(app_factory):
+    return app_factory()
+
+
+def _load_gunicorn_conf():
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", os.path.join(ROOT, "gunicorn.conf.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_draining_fails_readiness_and_closes_connections(client):
+    lifecycle.begin_draining("test")
+    res = client.get("/api/v1/students")
+    assert res.headers["Connection"] == "close"
+    assert client.get("/healthcheck/ready").status_code == 503
+
+
+def test_gunicorn_worker_exit_disposes_pool_and_flushes_logs(app, monkeypatch):
+    conf = _load_gunicorn_conf()
+    calls = []
+    monkeypatch.setattr(db.engine, "dispose", lambda: calls.append("dispose"))
+    # app.lifecycle is shadowed by the Lifecycle instance on the app package
+    monkeypatch.setattr(sys.modules["app.lifecycle"], "flush_logs", lambda: calls.append("flush"))
+
+    class FakeWorker:
+        wsgi = app
+
+    conf.worker_exit(None, FakeWorker())
+
+    assert calls == ["dispose", "flush"]
+    assert readiness.draining is True
+
+
+def test_gunicorn_sigterm_hook_flips_readiness(app):
+    conf = _load_gunicorn_conf()
+    calls = []
+
+    class FakeWorker:
+        wsgi = app
+
+        def handle_exit(self, sig, frame):
+            calls.append(sig)
+
+    previous = signal.getsignal(signal.SIGTERM)
+    try:
+        conf.post_worker_init(FakeWorker())
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+    assert calls == [signal.SIGTERM]
+    assert readiness.draining is True
+    assert conf.graceful_timeout == 30
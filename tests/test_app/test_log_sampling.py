@@ -0,0 +1,125 @@
+import logging
+import sys
+import pytest
+from prometheus_client import REGISTRY
+from app.log_sampling import LogSamplingFilter, parse_log_rates
+from app.logging_config import DEFAULT_LOG_RATES
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _record(name="app.errors", level=logging.INFO, msg="Student 1 not found"):
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+def _dropped(reason, logger="app.errors", level="INFO"):
+    return REGISTRY.get_sample_value(
+        "log_records_dropped_total", {"logger": logger, "level": level, "reason": reason}
+    ) or 0
+
+
+def test_parse_log_rates():
+    rules = parse_log_rates("app.services.student_service:INFO=0.01, app.errors=20/s")
+    assert rules == {
+        ("app.services.student_service", logging.INFO): ("sampled", 0.01),
+        ("app.errors", None): ("rate_limited", 20.0),
+    }
+    with pytest.raises(ValueError):
+        parse_log_rates("app:LOUD=0.5")
+
+
+def test_most_specific_rule_wins():
+    log_filter = LogSamplingFilter(rules=parse_log_rates("app=0,app.errors:WARNING=0,app.errors=1"))
+    assert log_filter.filter(_record("app.errors.handlers", logging.INFO))
+    assert not log_filter.filter(_record("app.errors", logging.WARNING))
+    assert not log_filter.filter(_record("app.services", logging.INFO))
+    assert log_filter.filter(_record("werkzeug", logging.INFO))
+
+
+def test_rate_limit_reports_suppressed_count():
+    clock = FakeClock()
+    log_filter = LogSamplingFilter(rules=parse_log_rates("app.errors=2/s"), clock=clock)
+    before = _dropped("rate_limited")
+
+    kept = [log_filter.filter(_record(msg=f"Student {i} not found")) for i in range(5)]
+    assert kept == [True, True, False, False, False]
+    assert _dropped("rate_limited") == before + 3
+
+    clock.now += 1
+    record = _record(msg="Student 9 not found")
+    assert log_filter.filter(record)
+    assert record.getMessage() == "Student 9 not found [3 suppressed]"
+
+
+def test_errors_are_never_rate_limited():
+    log_filter = LogSamplingFilter(rules=parse_log_rates("app.errors=0,app.errors:ERROR=0"), clock=FakeClock())
+    assert not log_filter.filter(_record(level=logging.WARNING))
+    for level in (logging.ERROR, logging.CRITICAL):
+        assert all(log_filter.filter(_record(level=level, msg="Database error")) for _ in range(100))
+
+
+def test_default_rules_cover_noisy_info_but_not_errors():
+    rules = parse_log_rates(DEFAULT_LOG_RATES)
+    assert rules[("app.services.student_service", logging.INFO)] == ("sampled", 0.1)
+    assert all(level is not None and level < logging.ERROR for _, level in rules)
+
+
+def test_sampling_keeps_a_fraction():
+    draws = iter([0.05, 0.5, 0.09, 0.95])
+    log_filter = LogSamplingFilter(
+        rules=parse_log_rates("app.services.student_service:INFO=0.1"), rand=lambda: next(draws)
+    )
+    kept = [log_filter.filter(_record("app.services.student_service", msg="Fetched all students")) for _ in range(4)]
+    assert kept == [True, False, True, False]
+
+
+def test_duplicates_are_collapsed_per_window():
+    clock = FakeClock()
+    log_filter = LogSamplingFilter(dedup_window=10, clock=clock)
+    before = _dropped("duplicate", logger="app.services", level="WARNING")
+
+    first = _record("app.services", logging.WARNING, "DB slow")
+    assert log_filter.filter(first)
+    assert not log_filter.filter(_record("app.services", logging.WARNING, "DB slow"))
+    assert not log_filter.filter(_record("app.services", logging.WARNING, "DB slow"))
+    # Different message or level is not a duplicate
+    assert log_filter.filter(_record("app.services", logging.ERROR, "DB slow"))
+    assert log_filter.filter(_record("app.services", logging.WARNING, "DB down"))
+    assert _dropped("duplicate", logger="app.services", level="WARNING") == before + 2
+
+    clock.now += 10
+    record = _record("app.services", logging.WARNING, "DB slow")
+    assert log_filter.filter(record)
+    assert record.getMessage() == "DB slow [2 suppressed]"
+
+
+def test_dedup_keys_are_bounded():
+    clock = FakeClock()
+    log_filter = LogSamplingFilter(dedup_window=10, dedup_max_keys=3, clock=clock)
+    for i in range(10):
+        assert log_filter.filter(_record(msg=f"message {i}"))
+    assert len(log_filter._seen) <= 3
+
+
+def _exc_record(level, exc):
+    try:
+        raise exc
+    except Exception:
+        return logging.LogRecord("app.errors", level, __file__, 1, "Database error", None, sys.exc_info())
+
+
+def test_different_exceptions_with_same_message_are_logged():
+    log_filter = LogSamplingFilter(dedup_window=10, clock=FakeClock())
+
+    assert log_filter.filter(_exc_record(logging.WARNING, ValueError("a")))
+    assert log_filter.filter(_exc_record(logging.WARNING, KeyError("b")))
+    assert not log_filter.filter(_exc_record(logging.WARNING, KeyError("c")))
+    # Errors are never collapsed: each one carries its own traceback
+    assert log_filter.filter(_exc_record(logging.ERROR, KeyError("d")))
+    assert log_filter.filter(_exc_record(logging.ERROR, KeyError("e")))
@@ -0,0 +1,151 @@
+import logging
+import os
+import runpy
+import signal
+import subprocess
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+import pytest
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+from app.health import readiness
+from app.memory import install_snapshot_signal, memory, read_rss_bytes, should_recycle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TOKEN = {"X-Debug-Token": "secret"}
+
+_leak = []
+
+
+@pytest.fixture
+def tracing():
+    memory.start()
+    yield memory
+    memory.stop()
+    _leak.clear()
+
+
+def _allocate():
+    _leak.append([object() for _ in range(20000)])
+
+
+ALLOCATION_SITE = f"test_memory.py:{_allocate.__code__.co_firstlineno + 1}"
+
+
+def test_read_rss_bytes():
+    rss = read_rss_bytes()
+    assert 10 * 2**20 < rss < 4 * 2**30
+
+
+def test_diff_points_at_growing_allocation_site(tracing):
+    _allocate()
+    report = tracing.diff(limit=5)
+
+    assert report["top"][0]["location"].endswith(ALLOCATION_SITE)
+    assert report["top"][0]["size_diff_kb"] > 100
+    # Baseline moved: nothing new since
+    assert all(row["location"] != report["top"][0]["location"] or row["size_diff_kb"] < 1
+               for row in tracing.diff(limit=5)["top"])
+
+
+def test_memory_endpoint(app_factory):
+    client = app_factory({"PROFILING_TOKEN": "secret"}).test_client()
+    assert client.get("/debug/memory").status_code == 403
+
+    idle = client.get("/debug/memory", headers=TOKEN).get_json()
+    assert idle["pid"] == os.getpid()
+    assert idle["rss_mb"] > 0
+    assert idle["tracing"] is False
+
+    try:
+        assert client.get("/debug/memory?start=true", headers=TOKEN).get_json()["tracing"] is True
+        _allocate()
+        report = client.get("/debug/memory?limit=3", headers=TOKEN).get_json()
+        assert len(report["top"]) == 3
+        assert any(row["location"].endswith(ALLOCATION_SITE) for row in report["top"])
+        assert client.get("/debug/memory?group_by=nope", headers=TOKEN).status_code == 400
+    finally:
+        assert client.get("/debug/memory?stop=true", headers=TOKEN).get_json()["tracing"] is False
+        _leak.clear()
+
+
+def test_rss_gauge_is_updated(client):
+    client.get("/api/v1/students")
+    assert REGISTRY.get_sample_value("worker_resident_memory_bytes") > 0
+
+
+def test_should_recycle_above_threshold():
+    before = REGISTRY.get_sample_value("worker_recycles_total", {"reason": "rss"}) or 0
+    assert not should_recycle(0)
+    assert not should_recycle(64 * 2**30)
+    assert should_recycle(1)
+    assert REGISTRY.get_sample_value("worker_recycles_total", {"reason": "rss"}) == before + 1
+
+
+def test_gunicorn_post_request_recycles_large_worker(monkeypatch):
+    monkeypatch.setenv("GUNICORN_MAX_WORKER_RSS_MB", "1")
+    monkeypatch.setenv("GUNICORN_RSS_CHECK_INTERVAL", "2")
+    hooks = runpy.run_path(os.path.join(ROOT, "gunicorn.conf.py"))
+    worker = SimpleNamespace(alive=True)
+    try:
+        hooks["post_request"](worker, None, {}, None)
+        assert worker.alive  # only every 2nd request is checked
+        hooks["post_request"](worker, None, {}, None)
+        assert not worker.alive
+        assert readiness.draining
+    finally:
+        readiness.draining = False
+
+
+def test_gunicorn_child_exit_drops_dead_worker_gauges(tmp_path, monkeypatch):
+    code = (
+        "import os\n"
+        "from app.extensions import WORKER_RSS\n"
+        "WORKER_RSS.set(123)\n"
+        "print(os.getpid())\n"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    pid = out.stdout.strip().splitlines()[-1]
+
+    def rss():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=str(tmp_path))
+        return registry.get_sample_value("worker_resident_memory_bytes", {"pid": pid})
+
+    assert rss() == 123
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    hooks = runpy.run_path(os.path.join(ROOT, "gunicorn.conf.py"))
+    hooks["child_exit"](None, SimpleNamespace(pid=int(pid)))
+    assert rss() is None
+
+
+def test_signal_logs_snapshot_diff(tracing, caplog):
+    previous = signal.getsignal(signal.SIGUSR2)
+    install_snapshot_signal(signal.SIGUSR2, limit=3)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.memory"):
+            _allocate()
+            os.kill(os.getpid(), signal.SIGUSR2)
+            deadline = time.monotonic() + 5
+            while not caplog.records and time.monotonic() < deadline:
+                time.sleep(0.01)
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+
+    assert "Memory growth since last snapshot" in caplog.records[0].getMessage()
+    assert tracemalloc.is_tracing()
+
+
+def test_request_metrics_use_route_templates(client):
+    for student_id in (101, 102, 103):
+        client.get(f"/api/v1/students/{student_id}")
+
+    labels = {
+        sample.labels["endpoint"]
+        for metric in REGISTRY.collect() if metric.name == "http_requests"
+        for sample in metric.samples
+    }
+    assert "/api/v1/students/<int:student_id>" in labels
+    assert not any(label.startswith("/api/v1/students/10") for label in labels)
@@ -0,0 +1,47 @@
+import time
+from app.profiling import SamplingProfiler, profiler
+
+
+def _busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling_profiler_collects_stacks():
+    sampler = SamplingProfiler(interval=0.001)
+    sampler.start("busy")
+    _busy_wait(0.05)
+    sampler.stop()
+
+    top = sampler.top()
+    assert top["busy"]["requests"] == 1
+    assert top["busy"]["samples"] > 0
+    assert any("_busy_wait" in s["stack"] for s in top["busy"]["stacks"])
+    assert sampler.collapsed().startswith("busy;")
+
+
+def test_profiler_disabled_registers_nothing(client):
+    res = client.get("/debug/profile")
+    assert res.status_code == 404
+
+
+def test_profile_endpoint_requires_token(app_factory):
+    app = app_factory({
+        "PROFILING_ENABLED": True,
+        "PROFILING_SAMPLE_RATE": 1.0,
+        "PROFILING_TOKEN": "secret",
+    })
+    profiler.reset()
+    client = app.test_client()
+    client.get("/api/v1/students")
+
+    assert client.get("/debug/profile").status_code == 403
+
+    res = client.get("/debug/profile", headers={"X-Debug-Token": "secret"})
+    assert res.status_code == 200
+    # The route was sampled even if the request was too quick to catch a stack
+    assert res.get_json()["students.get_students"]["requests"] == 1
+
+    res = client.get("/debug/profile?format=collapsed", headers={"X-Debug-Token": "secret"})
+    assert res.mimetype == "text/plain"
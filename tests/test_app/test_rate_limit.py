@@ -0,0 +1,157 @@
+import multiprocessing
+import time
+import pytest
+from flask import Flask
+from prometheus_client import REGISTRY
+from app.rate_limit import (
+    MemoryRateLimitStore, RedisRateLimitStore, SharedMemoryRateLimitStore, parse_limit, register_rate_limiting,
+)
+
+
+class FakeRedis:
+    """Records script calls and returns canned [allowed, tokens] replies."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def register_script(self, script):
+        assert "redis.call('TIME')" in script
+
+        def run(keys, args):
+            self.calls.append((keys, args))
+            return self.replies.pop(0)
+        return run
+
+
+class BrokenStore:
+    def consume(self, key, rate, burst):
+        raise ConnectionError("store down")
+
+
+def _consume_many(path, count, results):
+    store = SharedMemoryRateLimitStore(path, slots=64)
+    results.put(sum(store.consume("default:ip:1.2.3.4", 1 / 3600, 100).allowed for _ in range(count)))
+
+
+def test_parse_limit():
+    assert parse_limit("20/s") == (20.0, 20)
+    assert parse_limit("600/m:50") == (10.0, 50)
+    with pytest.raises(ValueError):
+        parse_limit("20/day")
+
+
+def test_memory_store_burst_then_refill():
+    store = MemoryRateLimitStore()
+    decisions = [store.consume("k", 100, 2) for _ in range(3)]
+    assert [d.allowed for d in decisions] == [True, True, False]
+    assert decisions[2].remaining == 0
+    assert 0 < decisions[2].retry_after <= 0.01
+
+    time.sleep(0.02)
+    assert store.consume("k", 100, 2).allowed
+    # Other keys have their own bucket
+    assert store.consume("other", 100, 2).allowed
+
+
+def test_memory_store_evicts_least_recent_buckets():
+    store = MemoryRateLimitStore(max_keys=10)
+    assert store.consume("busy", 1 / 3600, 1).allowed
+    for i in range(50):
+        store.consume(f"k{i}", 1 / 3600, 1)
+        assert not store.consume("busy", 1 / 3600, 1).allowed  # stays recent, keeps its empty bucket
+    assert len(store._buckets) == 10
+
+
+def test_shared_memory_store_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "ratelimit")
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_consume_many, args=(path, 60, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+
+    assert sum(results.get(timeout=5) for _ in workers) == 100
+
+
+def test_shared_memory_store_reuses_stalest_slot(tmp_path):
+    store = SharedMemoryRateLimitStore(str(tmp_path / "ratelimit"), slots=SharedMemoryRateLimitStore.PROBES)
+    for i in range(SharedMemoryRateLimitStore.PROBES + 5):
+        assert store.consume(f"client-{i}", 1, 1).allowed
+    assert not store.consume(f"client-{SharedMemoryRateLimitStore.PROBES + 4}", 1, 1).allowed
+
+
+def test_redis_store_interprets_script_reply():
+    client = FakeRedis([[1, "4.5"], [0, "0.25"]])
+    store = RedisRateLimitStore(client)
+
+    assert store.consume("default:ip:1.2.3.4", 2.0, 10) == (True, 4, 0.0, 2.75)
+    denied = store.consume("default:ip:1.2.3.4", 2.0, 10)
+    assert not denied.allowed
+    assert denied.retry_after == 0.375
+    assert client.calls[0] == (["ratelimit:default:ip:1.2.3.4"], [2.0, 10])
+
+
+@pytest.fixture
+def limited_app(app_factory):
+    return app_factory({
+        "RATE_LIMIT_ENABLED": True,
+        "RATE_LIMITS": {"default": "1/h:2", "students.get_students": "1/h:1"},
+        "RATE_LIMIT_API_KEYS": ["k1"],
+    })
+
+
+def test_429_with_rate_limit_headers(limited_app):
+    client = limited_app.test_client()
+    headers = {"X-Real-IP": "10.0.0.1"}
+
+    first = client.get("/api/v1/students/12345", headers=headers)
+    assert first.status_code == 404
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert first.headers["RateLimit-Remaining"] == "1"
+
+    client.get("/api/v1/students/12345", headers=headers)
+    limited = client.get("/api/v1/students/12345", headers=headers)
+    assert limited.status_code == 429
+    assert limited.headers["RateLimit-Remaining"] == "0"
+    assert int(limited.headers["Retry-After"]) > 0
+    assert limited.get_json()["message"] == "Too many requests"
+    assert REGISTRY.get_sample_value("rate_limited_requests_total", {"route": "default"}) >= 1
+
+
+def test_limits_are_per_client_and_route(limited_app):
+    client = limited_app.test_client()
+    assert client.get("/api/v1/students", headers={"X-Real-IP": "10.0.0.2"}).status_code == 200
+    assert client.get("/api/v1/students", headers={"X-Real-IP": "10.0.0.2"}).status_code == 429
+    # Own bucket per route, per IP and per API key
+    assert client.get("/api/v1/students/1", headers={"X-Real-IP": "10.0.0.2"}).status_code == 404
+    assert client.get("/api/v1/students", headers={"X-Real-IP": "10.0.0.3"}).status_code == 200
+    assert client.get("/api/v1/students", headers={"X-Real-IP": "10.0.0.2", "X-API-Key": "k1"}).status_code == 200
+    assert client.get("/api/v1/students", headers={"X-Real-IP": "10.0.0.2", "X-API-Key": "k1"}).status_code == 429
+    # Probes and metrics are never limited
+    for _ in range(3):
+        assert client.get("/healthcheck/live").status_code == 200
+
+
+def test_unknown_api_keys_share_the_ip_bucket(limited_app):
+    client = limited_app.test_client()
+    statuses = [
+        client.get("/api/v1/students", headers={"X-Real-IP": "10.0.0.4", "X-API-Key": f"random-{i}"}).status_code
+        for i in range(5)
+    ]
+    assert statuses == [200, 429, 429, 429, 429]
+
+
+def test_store_failure_fails_open():
+    app = Flask(__name__)
+    app.config.update(RATE_LIMITS={"default": "1/h:1"}, RATE_LIMIT_BLUEPRINTS=(None,))
+    app.add_url_rule("/ping", "ping", lambda: "pong")
+    register_rate_limiting(app, store=BrokenStore())
+    before = REGISTRY.get_sample_value("rate_limit_backend_errors_total") or 0
+
+    client = app.test_client()
+    assert client.get("/ping").status_code == 200
+    assert client.get("/ping").status_code == 200
+    assert REGISTRY.get_sample_value("rate_limit_backend_errors_total") == before + 2
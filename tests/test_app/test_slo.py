@@ -0,0 +1,115 @@
+import logging
+import os
+import subprocess
+import sys
+from prometheus_client import REGISTRY
+from app.slo import LatencyQuantiles, latency_quantiles, route_histogram
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STUDENT_ROUTE = "/api/v1/students/<int:student_id>"
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_route_histogram_is_reused_and_warns_on_new_buckets(caplog):
+    first = route_histogram("bucket-check", [0.1, 0.5])
+    with caplog.at_level(logging.WARNING, "app.slo"):
+        assert route_histogram("bucket-check", (0.1, 0.5)) is first
+        assert not caplog.records
+        assert route_histogram("bucket-check", [0.1, 1.0]) is first
+    assert "keeping the first layout" in caplog.text
+
+
+def test_latency_quantiles_nearest_rank():
+    quantiles = LatencyQuantiles(window=100)
+    for ms in range(1, 201):
+        quantiles.observe("GET /x", ms / 1000)
+
+    stats = quantiles.snapshot()["GET /x"]
+    # Only the last 100 samples (101..200 ms) are kept
+    assert stats["count"] == 100
+    assert stats["p50"] == 150
+    assert stats["p99"] == 199
+    assert stats["max"] == 200
+
+
+def test_read_route_uses_fine_buckets(client):
+    before = _sample(
+        "http_read_request_duration_seconds_bucket", method="GET", route=STUDENT_ROUTE, le="0.1"
+    )
+    client.get("/api/v1/students/12345")
+
+    assert _sample(
+        "http_read_request_duration_seconds_bucket", method="GET", route=STUDENT_ROUTE, le="0.1"
+    ) == before + 1
+    # Single-row reads get buckets well below 100 ms
+    assert REGISTRY.get_sample_value(
+        "http_read_request_duration_seconds_bucket", {"method": "GET", "route": STUDENT_ROUTE, "le": "0.001"}
+    ) is not None
+
+
+def test_budget_burn_counts_slow_and_failed_requests(app_factory):
+    app = app_factory({
+        "SLO_TARGETS": {
+            "read": {"latency": 0.0, "objective": 0.999},
+            "default": {"latency": 10.0, "objective": 0.99},
+        },
+        "PROPAGATE_EXCEPTIONS": False,
+    })
+    client = app.test_client()
+    labels = {"route": STUDENT_ROUTE, "slo_class": "read"}
+    requests_before = _sample("slo_requests_total", **labels)
+    latency_before = _sample("slo_error_budget_burn_total", reason="latency", **labels)
+    error_before = _sample("slo_error_budget_burn_total", route="/api/v1/error", slo_class="default", reason="error")
+
+    client.get("/api/v1/students/12345")
+    client.get("/api/v1/error")
+
+    assert _sample("slo_requests_total", **labels) == requests_before + 1
+    assert _sample("slo_error_budget_burn_total", reason="latency", **labels) == latency_before + 1
+    assert _sample(
+        "slo_error_budget_burn_total", route="/api/v1/error", slo_class="default", reason="error"
+    ) == error_before + 1
+    assert _sample("slo_objective_ratio", slo_class="read") == 0.999
+
+
+def test_probes_are_not_counted(client):
+    before = _sample("slo_requests_total", route="/healthcheck/live", slo_class="default")
+    client.get("/healthcheck/live")
+    assert _sample("slo_requests_total", route="/healthcheck/live", slo_class="default") == before
+
+
+def test_latency_endpoint_requires_token(app_factory):
+    app = app_factory({"PROFILING_TOKEN": "secret"})
+    client = app.test_client()
+    latency_quantiles.reset()
+    client.get("/api/v1/students/12345")
+
+    assert client.get("/debug/latency").status_code == 403
+
+    res = client.get("/debug/latency?reset=true", headers={"X-Debug-Token": "secret"})
+    assert res.status_code == 200
+    stats = res.get_json()[f"GET {STUDENT_ROUTE}"]
+    assert stats["count"] == 1
+    assert {"p50", "p95", "p99", "max"} <= set(stats)
+    assert latency_quantiles.snapshot() == {}
+
+
+def test_slo_metrics_with_multiprocess_collector(tmp_path):
+    code = (
+        "from prometheus_client import generate_latest\n"
+        "from app import create_app\n"
+        "from app.extensions import get_prometheus_registry\n"
+        "app = create_app('testing')\n"
+        "client = app.test_client()\n"
+        "client.get('/api/v1/students/1')\n"
+        "print(generate_latest(get_prometheus_registry()).decode())\n"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT, LOG_LEVEL="WARNING", PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+    assert 'http_read_request_duration_seconds_bucket{le="0.001",method="GET",route="/api/v1/students/<int:student_id>"}' in out.stdout
+    assert 'slo_requests_total{route="/api/v1/students/<int:student_id>",slo_class="read"} 1.0' in out.stdout
+    assert 'slo_objective_ratio{slo_class="read"} 0.99' in out.stdout
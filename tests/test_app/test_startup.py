@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _loaded_after_create_app(extra_env=None):
+    code = (
+        "import sys\n"
+        "from app import create_app\n"
+        "create_app('testing')\n"
+        "print(','.join(m for m in ('flask_migrate', 'alembic', 'marshmallow_sqlalchemy') if m in sys.modules))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT, LOG_LEVEL="WARNING")
+    env.pop("FLASK_RUN_FROM_CLI", None)
+    env.update(extra_env or {})
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return out.stdout.strip().splitlines()[-1] if out.stdout.strip() else ""
+
+
+def test_serving_app_skips_migration_and_schema_imports():
+    assert _loaded_after_create_app() == ""
+
+
+def test_flask_cli_loads_migrations():
+    assert "flask_migrate" in _loaded_after_create_app({"FLASK_RUN_FROM_CLI": "true"})
@@ -0,0 +1,167 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from app.logging_config import JSONFormatter
+from app.tracing import (
+    BatchSpanProcessor, OTLPHttpSpanExporter, RequestIdFilter, Span, build_exporter, tracer,
+)
+
+STUDENT = {"name": "Alice", "age": 10, "grade": "5th", "email": "alice@example.com"}
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.addFilter(RequestIdFilter())
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def traced_app(app_factory):
+    app = app_factory({"TRACING_ENABLED": True, "TRACING_EXPORTER": "stdout"})
+    exporter = ListExporter()
+    tracer.processor.exporter = exporter
+    yield app, exporter
+    tracer.configure(None)
+
+
+def test_request_id_is_generated_or_propagated(client):
+    generated = client.get("/api/v1/students").headers["X-Request-ID"]
+    assert len(generated) == 32
+
+    res = client.get("/api/v1/students", headers={"X-Request-ID": "nginx-abc.123"})
+    assert res.headers["X-Request-ID"] == "nginx-abc.123"
+
+    # Anything that could break log lines is replaced
+    res = client.get("/api/v1/students", headers={"X-Request-ID": "bad id {}"})
+    assert res.headers["X-Request-ID"] != "bad id {}"
+
+
+def test_request_id_is_stamped_on_log_records(client):
+    handler = ListHandler()
+    service_logger = logging.getLogger("app.services.student_service")
+    service_logger.addHandler(handler)
+    try:
+        client.get("/api/v1/students", headers={"X-Request-ID": "req-42"})
+    finally:
+        service_logger.removeHandler(handler)
+
+    assert handler.records
+    assert all(record.request_id == "req-42" for record in handler.records)
+    assert json.loads(JSONFormatter().format(handler.records[0]))["request_id"] == "req-42"
+
+    outside = logging.LogRecord("x", logging.INFO, __file__, 1, "msg", None, None)
+    RequestIdFilter().filter(outside)
+    assert "request_id" not in json.loads(JSONFormatter().format(outside))
+
+
+def test_spans_cover_route_schema_service_and_sql(traced_app):
+    app, exporter = traced_app
+    client = app.test_client()
+    client.post("/api/v1/students", json=STUDENT, headers={"X-Request-ID": "req-7"})
+    tracer.flush()
+
+    by_name = {}
+    for span in exporter.spans:
+        by_name.setdefault(span.name, []).append(span)
+    root = by_name["POST /api/v1/students"][0]
+    service = by_name["student_service.create_student"][0]
+
+    assert root.parent_id is None
+    assert root.attributes["request.id"] == "req-7"
+    assert root.attributes["http.status_code"] == 201
+    assert by_name["schema.load"][0].parent_id == root.span_id
+    assert service.parent_id == root.span_id
+    assert by_name["sql"]
+    assert all(span.parent_id == service.span_id for span in by_name["sql"])
+    assert any("INSERT INTO students" in span.attributes["db.statement"] for span in by_name["sql"])
+    assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+
+
+def test_failed_span_records_error_and_traceparent(traced_app):
+    app, exporter = traced_app
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    client = app.test_client()
+    client.get(
+        "/api/v1/students/12345",
+        headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"},
+    )
+    tracer.flush()
+
+    service = next(s for s in exporter.spans if s.name == "student_service.get_student_by_id")
+    root = next(s for s in exporter.spans if s.parent_id == "00f067aa0ba902b7")
+    assert root.trace_id == trace_id
+    assert service.error.startswith("NotFoundError")
+
+
+def test_tracing_disabled_exports_nothing(client):
+    assert tracer.processor is None
+    res = client.get("/api/v1/students")
+    assert res.status_code == 200
+
+
+def test_batch_processor_drops_when_queue_is_full():
+    exporter = ListExporter()
+    processor = BatchSpanProcessor(exporter, max_queue_size=2, batch_size=10, schedule_delay=60)
+    for i in range(3):
+        span = Span(f"s{i}", "0" * 32)
+        span.end_ns = span.start_ns
+        processor.on_end(span)
+    processor.flush()
+    assert [span.name for span in exporter.spans] == ["s0", "s1"]
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    span = Span("work", "a" * 32, attributes={"k": "v"})
+    span.end_ns = span.start_ns + 1_500_000
+    build_exporter(f"file:{path}").export([span])
+
+    line = json.loads(path.read_text())
+    assert line["name"] == "work"
+    assert line["duration_ms"] == 1.5
+
+
+def test_otlp_exporter_posts_resource_spans():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append((self.path, json.loads(self.rfile.read(int(self.headers["Content-Length"])))))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        exporter = build_exporter(f"http://127.0.0.1:{server.server_port}/v1/traces", service_name="svc")
+        assert isinstance(exporter, OTLPHttpSpanExporter)
+        span = Span("sql", "b" * 32, parent_id="c" * 16, attributes={"rows": 3})
+        span.end_ns = span.start_ns + 10
+        exporter.export([span])
+    finally:
+        server.shutdown()
+
+    path, body = received[0]
+    resource_spans = body["resourceSpans"][0]
+    otlp_span = resource_spans["scopeSpans"][0]["spans"][0]
+    assert path == "/v1/traces"
+    assert {"key": "service.name", "value": {"stringValue": "svc"}} in resource_spans["resource"]["attributes"]
+    assert otlp_span["parentSpanId"] == "c" * 16
+    assert otlp_span["attributes"] == [{"key": "rows", "value": {"intValue": "3"}}]
@@ -0,0 +1,84 @@
+import logging
+from flask import g
+from sqlalchemy import text
+from app.db_instrumentation import count_queries, normalize_sql
+from app.extensions import db
+
+STUDENT = {"name": "Alice", "age": 10, "grade": "5th", "email": "alice@example.com"}
+
+
+def _create(client):
+    return client.post("/api/v1/students", json=STUDENT).get_json()["data"]["id"]
+
+
+def test_create_student_query_budget(client, max_queries):
+    # duplicate check + insert + outbox insert + refresh after commit
+    with max_queries(4):
+        res = client.post("/api/v1/students", json=STUDENT)
+    assert res.status_code == 201
+
+
+def test_list_students_query_budget(client, max_queries):
+    for i in range(5):
+        client.post("/api/v1/students", json={**STUDENT, "email": f"s{i}@example.com"})
+    # one SELECT no matter how many rows (no N+1)
+    with max_queries(1):
+        client.get("/api/v1/students")
+
+
+def test_get_student_query_budget(client, max_queries):
+    student_id = _create(client)
+    with max_queries(1):
+        client.get(f"/api/v1/students/{student_id}")
+
+
+def test_get_student_by_email_query_budget(client, max_queries):
+    _create(client)
+    with max_queries(1):
+        client.get("/api/v1/students", query_string={"email": STUDENT["email"]})
+
+
+def test_batch_get_students_query_budget(client, max_queries):
+    ids = [client.post("/api/v1/students", json={**STUDENT, "email": f"s{i}@example.com"}).get_json()["data"]["id"]
+           for i in range(5)]
+    # one IN query regardless of how many ids are asked for
+    with max_queries(1):
+        client.post("/api/v1/students/batch-get", json={"ids": ids + [999999]})
+
+
+def test_update_student_query_budget(client, max_queries):
+    student_id = _create(client)
+    # UPDATE ... RETURNING + outbox insert
+    with max_queries(2):
+        client.put(f"/api/v1/students/{student_id}", json={"email": "new@example.com"})
+
+
+def test_delete_student_query_budget(client, max_queries):
+    student_id = _create(client)
+    # soft-delete UPDATE + outbox insert
+    with max_queries(2):
+        client.delete(f"/api/v1/students/{student_id}")
+
+
+def test_server_timing_header(client):
+    res = client.get("/api/v1/students")
+    assert 'db;dur=' in res.headers["Server-Timing"]
+    assert 'desc="1 queries"' in res.headers["Server-Timing"]
+
+
+def test_transaction_control_is_timed_but_not_counted(app, monkeypatch, caplog):
+    monkeypatch.setitem(app.config, "SQL_SLOW_QUERY_MS", 0)
+    with app.test_request_context(), count_queries() as statements, caplog.at_level(logging.WARNING, "app.sql"):
+        g._db_queries, g._db_time = 0, 0.0
+        db.session.execute(text("SAVEPOINT budget_check"))
+        db.session.execute(text("RELEASE SAVEPOINT budget_check"))
+
+        assert statements == []
+        assert g._db_queries == 0
+        assert g._db_time > 0
+    assert "Slow query" in caplog.text and "SAVEPOINT budget_check" in caplog.text
+
+
+def test_normalize_sql():
+    sql = "SELECT *\n  FROM students WHERE email = 'a@x.com' AND id IN (1, 2, 3) LIMIT 10"
+    assert normalize_sql(sql) == "SELECT * FROM students WHERE email = ? AND id IN (...) LIMIT ?"
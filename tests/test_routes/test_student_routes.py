@@ -29,6 +29,50 @@ def test_add_and_get_student_route(client):
     assert data["data"]["name"] == "Alice"
 
 
+def test_add_student_normalizes_email_route(client):
+    payload = {"name": "Alice", "age": 10, "grade": "5th", "email": "  Alice@Example.COM "}
+    res = client.post("/api/v1/students", json=payload)
+    assert res.status_code == 201
+    assert res.get_json()["data"]["email"] == "alice@example.com"
+
+    payload["email"] = "alice@EXAMPLE.com"
+    res = client.post("/api/v1/students", json=payload)
+    assert res.status_code == 409
+
+
+def test_get_student_by_email_route(client):
+    payload = {"name": "Alice", "age": 10, "grade": "5th", "email": "alice@example.com"}
+    student_id = client.post("/api/v1/students", json=payload).get_json()["data"]["id"]
+
+    res = client.get("/api/v1/students", query_string={"email": "ALICE@example.com"})
+    assert res.status_code == 200
+    assert [s["id"] for s in res.get_json()["data"]] == [student_id]
+
+    res = client.get("/api/v1/students", query_string={"email": "nobody@example.com"})
+    assert res.status_code == 200
+    assert res.get_json()["data"] == []
+
+
+def test_batch_get_students_route(client):
+    ids = []
+    for name in ("Ann", "Ben", "Cal"):
+        payload = {"name": name, "age": 10, "grade": "5th", "email": f"{name.lower()}@example.com"}
+        ids.append(client.post("/api/v1/students", json=payload).get_json()["data"]["id"])
+
+    res = client.post("/api/v1/students/batch-get", json={"ids": [ids[2], 999999, ids[0], ids[2]]})
+    assert res.status_code == 200
+    data = res.get_json()["data"]
+    assert [s["name"] for s in data["students"]] == ["Cal", "Ann"]
+    assert data["missing_ids"] == [999999]
+
+
+@pytest.mark.parametrize("body", [{}, {"ids": []}, {"ids": ["1"]}, {"ids": list(range(1, 102))}])
+def test_batch_get_students_invalid_route(client, body):
+    res = client.post("/api/v1/students/batch-get", json=body)
+    assert res.status_code == 400
+    assert res.get_json()["status"] == "error"
+
+
 def test_get_student_not_found_route(client):
     res = client.get("/api/v1/students/999999")
     assert res.status_code == 404
@@ -50,6 +94,21 @@ def test_update_student_route(client):
     assert json["data"]["name"] == "Bobby"
 
 
+def test_patch_student_route(client):
+    payload = {"name": "Dana", "age": 11, "grade": "6th", "email": "dana@example.com"}
+    student_id = client.post("/api/v1/students", json=payload).get_json()["data"]["id"]
+    client.post("/api/v1/students", json={**payload, "email": "taken@example.com"})
+
+    res = client.patch(f"/api/v1/students/{student_id}", json={"email": " Dana.New@Example.com"})
+    assert res.status_code == 200
+    assert res.get_json()["data"] == {"id": student_id, "name": "Dana", "email": "dana.new@example.com"}
+
+    assert client.patch(f"/api/v1/students/{student_id}", json={"age": 200}).status_code == 400
+    assert client.patch(f"/api/v1/students/{student_id}", json={"id": 5}).status_code == 400
+    assert client.patch(f"/api/v1/students/{student_id}", json={"email": "TAKEN@example.com"}).status_code == 409
+    assert client.patch("/api/v1/students/999999", json={"name": "Nobody"}).status_code == 404
+
+
 def test_delete_student_route(client):
     payload = {"name": "Charlie", "age": 12, "grade": "7th", "email": "charlie@example.com"}
     res = client.post("/api/v1/students", json=payload)
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models.student import Student
+from app.models.student_archive import StudentArchive
+from app.services import archive_service, student_service
+from app.utils.custom_errors import NotFoundError
+
+
+def _add(session, email, days_old):
+    stamp = datetime.utcnow() - timedelta(days=days_old)
+    student = Student(name="Old", age=10, grade="5th", email=email, created_at=stamp, updated_at=stamp)
+    session.add(student)
+    session.commit()
+    return student.id
+
+
+def test_archive_moves_only_inactive_students_in_batches(session):
+    old_ids = [_add(session, f"old{i}@example.com", days_old=800) for i in range(5)]
+    fresh_id = _add(session, "fresh@example.com", days_old=1)
+    progress = []
+
+    moved = archive_service.archive_inactive_students(730, batch_size=2, progress=progress.append)
+
+    assert moved == 5
+    assert progress == [2, 4, 5]
+    assert [s.id for s in Student.query.all()] == [fresh_id]
+    archived = StudentArchive.query.order_by(StudentArchive.id).all()
+    assert [a.id for a in archived] == old_ids
+    assert archived[0].email == "old0@example.com"
+    assert archived[0].archived_at is not None
+
+
+def test_archive_respects_max_batches(session):
+    for i in range(5):
+        _add(session, f"old{i}@example.com", days_old=800)
+    assert archive_service.archive_inactive_students(730, batch_size=2, max_batches=1) == 2
+    assert Student.query.count() == 3
+
+
+def test_reads_skip_archive_unless_asked(session):
+    student_id = _add(session, "gone@example.com", days_old=800)
+    archive_service.archive_inactive_students(730)
+
+    with pytest.raises(NotFoundError):
+        student_service.get_student_by_id(student_id)
+    assert student_service.get_student_by_id(student_id, include_archived=True)["archived"] is True
+
+
+def test_archive_command(app, session):
+    _add(session, "old@example.com", days_old=10)
+    result = app.test_cli_runner().invoke(args=["students", "archive", "--older-than-days", "5", "--pause", "0"])
+    assert result.exit_code == 0, result.output
+    assert "Archived 1 students" in result.output
+    assert StudentArchive.query.count() == 1
+
+
+def test_purge_removes_only_old_tombstones(session):
+    old_ids = [_add(session, f"gone{i}@example.com", days_old=1) for i in range(3)]
+    recent_id = _add(session, "recent@example.com", days_old=1)
+    live_id = _add(session, "live@example.com", days_old=1)
+    for student_id in old_ids:
+        student_service.delete_student(student_id)
+    Student.query.filter(Student.id.in_(old_ids)).update(
+        {"deleted_at": datetime.utcnow() - timedelta(days=40)}, synchronize_session=False
+    )
+    student_service.delete_student(recent_id)
+    session.commit()
+
+    assert archive_service.purge_deleted_students(720, batch_size=2) == 3
+    assert sorted(s.id for s in Student.query.all()) == [recent_id, live_id]
+
+
+def test_archive_skips_tombstones(session):
+    student_id = _add(session, "old@example.com", days_old=800)
+    student_service.delete_student(student_id)
+    Student.query.filter_by(id=student_id).update({"updated_at": datetime.utcnow() - timedelta(days=800)})
+    session.commit()
+
+    assert archive_service.archive_inactive_students(730) == 0
+
+
+def test_purge_command(app, session):
+    student_id = _add(session, "old@example.com", days_old=1)
+    student_service.delete_student(student_id)
+    result = app.test_cli_runner().invoke(args=["students", "purge", "--older-than-hours", "0", "--pause", "0"])
+    assert result.exit_code == 0, result.output
+    assert "Purged 1 deleted students" in result.output
@@ -0,0 +1,132 @@
+import json
+import signal
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.models.outbox import OutboxEvent
+from app.models.student import Student
+from app.services import outbox_service, student_service
+from app.utils.event_sinks import WebhookSink
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    def send(self, events):
+        self.events.extend(events)
+
+
+class FailingSink:
+    def send(self, events):
+        raise ConnectionError("sink down")
+
+
+@pytest.fixture
+def webhook_stub():
+    """Local HTTP stub that records posted batches."""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers["Content-Length"])
+            received.append(json.loads(self.rfile.read(length)))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/events", received
+    server.shutdown()
+
+
+def test_writes_record_outbox_events(session):
+    created = student_service.create_student(Student(name="Alice", age=10, grade="5th", email="alice@example.com"))
+    student_service.update_student(created["id"], {"name": "Alicia"})
+    student_service.delete_student(created["id"])
+
+    events = OutboxEvent.query.order_by(OutboxEvent.id).all()
+    assert [e.event_type for e in events] == ["student.created", "student.updated", "student.deleted"]
+    assert json.loads(events[1].payload)["name"] == "Alicia"
+    assert all(e.aggregate_id == created["id"] for e in events)
+
+
+def test_failed_write_records_no_event(session):
+    student_service.create_student(Student(name="Bob", age=11, grade="6th", email="bob@example.com"))
+    with pytest.raises(Exception):
+        student_service.create_student(Student(name="Bob", age=11, grade="6th", email="bob@example.com"))
+    assert OutboxEvent.query.count() == 1
+
+
+def test_dispatch_batch_marks_events_delivered(session):
+    student_service.create_student(Student(name="Carl", age=12, grade="7th", email="carl@example.com"))
+    sink = ListSink()
+
+    assert outbox_service.dispatch_batch(sink, batch_size=10) == 1
+    assert sink.events[0]["type"] == "student.created"
+    assert sink.events[0]["data"]["email"] == "carl@example.com"
+    assert outbox_service.dispatch_batch(sink, batch_size=10) == 0
+    assert outbox_service.update_lag_metrics() == (0, 0.0)
+
+
+def test_failed_dispatch_keeps_events_pending(session):
+    student_service.create_student(Student(name="Dan", age=12, grade="7th", email="dan@example.com"))
+
+    assert outbox_service.dispatch_batch(FailingSink()) == 0
+    event = OutboxEvent.query.one()
+    assert event.dispatched_at is None
+    assert event.attempts == 1
+    assert "sink down" in event.last_error
+    assert outbox_service.update_lag_metrics()[0] == 1
+
+
+def test_webhook_sink_delivers_batch(session, webhook_stub):
+    url, received = webhook_stub
+    student_service.create_student(Student(name="Eve", age=14, grade="9th", email="eve@example.com"))
+
+    assert outbox_service.dispatch_batch(WebhookSink(url)) == 1
+    assert received[0]["events"][0]["data"]["name"] == "Eve"
+
+
+def test_dispatch_cli_drains_once(app, tmp_path):
+    student_service.create_student(Student(name="Fay", age=14, grade="9th", email="fay@example.com"))
+    out = tmp_path / "events.jsonl"
+
+    result = app.test_cli_runner().invoke(args=["outbox", "dispatch", "--once", "--sink", f"file:{out}"])
+    assert result.exit_code == 0, result.output
+    lines = out.read_text().splitlines()
+    assert json.loads(lines[0])["type"] == "student.created"
+
+
+def test_dispatch_cli_stopped_before_first_batch(app, monkeypatch):
+    # SIGTERM right away: the loop never runs
+    monkeypatch.setattr(signal, "signal", lambda sig, handler: handler(sig, None))
+    result = app.test_cli_runner().invoke(args=["outbox", "dispatch", "--sink", "stdout"])
+    assert result.exit_code == 0, result.output
+    assert "0 events pending" in result.output
+
+
+def test_dispatch_cli_survives_database_errors(app, monkeypatch, caplog):
+    handlers, sleeps, calls = [], [], []
+    monkeypatch.setattr(signal, "signal", lambda sig, handler: handlers.append(handler))
+    monkeypatch.setattr("app.commands.time.sleep", sleeps.append)
+
+    def flaky_dispatch(sink, batch_size):
+        calls.append(1)
+        if len(calls) == 1:
+            raise OperationalError("SELECT", {}, Exception("server closed the connection"))
+        handlers[0](signal.SIGTERM, None)
+        return 0
+
+    monkeypatch.setattr(outbox_service, "dispatch_batch", flaky_dispatch)
+    result = app.test_cli_runner().invoke(args=["outbox", "dispatch", "--sink", "stdout", "--interval", "3"])
+
+    assert result.exit_code == 0, result.output
+    assert len(calls) == 2
+    assert sleeps == [3.0, 3.0]
+    assert "Outbox dispatch failed, retrying" in caplog.text
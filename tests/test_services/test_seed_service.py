@@ -0,0 +1,32 @@
+from datetime import datetime
+from app.models.student import Student
+from app.services.seed_service import bulk_load_students
+from app.utils.data_generator import generate_students
+
+
+def test_bulk_load_students(session):
+    progress = []
+    loaded = bulk_load_students(generate_students(250), batch_size=100, progress=progress.append)
+
+    assert loaded == 250
+    assert progress == [100, 200, 250]
+    assert Student.query.count() == 250
+
+
+def test_seed_command_appends_with_start(app):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["students", "seed", "--count", "40", "--batch-size", "16"])
+    assert result.exit_code == 0, result.output
+    assert "Seeded 40 students" in result.output
+
+    # Same seed again from index 40 adds new, non-conflicting rows
+    result = runner.invoke(args=["students", "seed", "--count", "10", "--start", "40"])
+    assert result.exit_code == 0, result.output
+    assert Student.query.count() == 50
+
+
+def test_seed_command_now_moves_the_timestamps(app):
+    result = app.test_cli_runner().invoke(args=["students", "seed", "--count", "20", "--now", "2030-06-01"])
+    assert result.exit_code == 0, result.output
+    newest = max(student.created_at for student in Student.query.all())
+    assert datetime(2027, 6, 1) < newest <= datetime(2030, 6, 1)
@@ -1,6 +1,7 @@
 import pytest
 from app.models.student import Student
 from app.services import student_service
+from marshmallow import ValidationError
 from app.utils.custom_errors import DuplicateError, NotFoundError
 from app.extensions import db
 
@@ -26,6 +27,14 @@ def test_create_student_duplicate_service(session):
         student_service.create_student(dup)
 
 
+def test_create_student_duplicate_email_case_insensitive_service(session):
+    student_service.create_student(Student(name="Bob", age=11, grade="6th", email="Bob@Example.com"))
+
+    with pytest.raises(DuplicateError):
+        student_service.create_student(Student(name="Bobby", age=12, grade="7th", email=" bob@example.COM"))
+    assert Student.query.one().email == "bob@example.com"
+
+
 def test_get_all_students_service(session):
     # ensure at least one student exists
     s1 = Student(name="Carl", age=12, grade="7th", email="carl@example.com")
@@ -74,6 +83,25 @@ def test_update_student_duplicate_email_service(session):
         student_service.update_student(s2.id, {"email": "one@example.com"})
 
 
+def test_update_student_rejects_non_whitelisted_fields_service(session):
+    s = Student(name="Hal", age=15, grade="10th", email="hal@example.com")
+    session.add(s)
+    session.commit()
+
+    with pytest.raises(ValidationError):
+        student_service.update_student(s.id, {"created_at": "2000-01-01"})
+
+
+def test_update_student_email_case_change_service(session):
+    s = Student(name="Gail", age=15, grade="10th", email="gail@example.com")
+    session.add(s)
+    session.commit()
+
+    # Same address in another case is not a duplicate of itself
+    resp = student_service.update_student(s.id, {"email": "GAIL@example.com"})
+    assert resp["email"] == "gail@example.com"
+
+
 def test_delete_student_service(session):
     s = Student(name="Frank", age=17, grade="12th", email="frank@example.com")
     session.add(s)
@@ -81,8 +109,29 @@ def test_delete_student_service(session):
 
     resp = student_service.delete_student(s.id)
     assert resp == {"student_id": s.id}
-    # ensure deleted
-    assert Student.query.get(s.id) is None
+    # ensure deleted: tombstoned and hidden from reads
+    session.refresh(s)
+    assert s.deleted_at is not None
+    with pytest.raises(NotFoundError):
+        student_service.get_student_by_id(s.id)
+    with pytest.raises(NotFoundError):
+        student_service.delete_student(s.id)
+
+
+def test_deleted_student_hidden_and_email_reusable_service(session):
+    s = Student(name="Gina", age=17, grade="12th", email="gina@example.com")
+    session.add(s)
+    session.commit()
+    student_service.delete_student(s.id)
+
+    assert student_service.get_all_students() == []
+    assert student_service.get_student_by_email("gina@example.com") is None
+    assert student_service.get_students_by_ids([s.id])["missing_ids"] == [s.id]
+    with pytest.raises(NotFoundError):
+        student_service.update_student(s.id, {"name": "Gin"})
+
+    again = student_service.create_student(Student(name="Gina", age=17, grade="12th", email="gina@example.com"))
+    assert again["id"] != s.id
 
 
 def test_delete_student_not_found_service(session):
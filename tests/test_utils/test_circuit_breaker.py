@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.extensions import db_breaker
+from app.utils.circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+from app.utils.custom_errors import NotFoundError, ServiceUnavailableError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _db_down():
+    raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10, clock=FakeClock())
+    failing = breaker(_db_down)
+
+    for _ in range(2):
+        with pytest.raises(OperationalError):
+            failing()
+    assert breaker.state == OPEN
+
+    # Fails fast without calling the function
+    with pytest.raises(ServiceUnavailableError):
+        failing()
+
+
+def test_breaker_half_open_probe_closes_on_success():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+    with pytest.raises(OperationalError):
+        breaker(_db_down)()
+    assert breaker.state == OPEN
+
+    clock.now = 11
+    assert breaker.state == HALF_OPEN
+    assert breaker(lambda: "ok")() == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_breaker_ignores_business_errors():
+    breaker = CircuitBreaker("test", failure_threshold=1, clock=FakeClock())
+
+    @breaker
+    def missing():
+        raise NotFoundError("nope")
+
+    with pytest.raises(NotFoundError):
+        missing()
+    assert breaker.state == CLOSED
+
+
+@pytest.fixture
+def open_db_breaker():
+    """Trip the shared breaker, closed again afterwards whatever the test does."""
+    for _ in range(db_breaker.failure_threshold):
+        db_breaker.record_failure()
+    try:
+        yield db_breaker
+    finally:
+        db_breaker.reset()
+
+
+def test_open_breaker_returns_503_route(client, open_db_breaker):
+    res = client.get("/api/v1/students")
+    assert res.status_code == 503
+    assert "Retry-After" in res.headers
+    assert res.get_json()["status"] == "error"
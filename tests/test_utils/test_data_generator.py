@@ -0,0 +1,37 @@
+from datetime import datetime
+from app.utils.data_generator import CHUNK_SIZE, generate_students
+
+NOW = datetime(2026, 1, 1)
+
+
+def test_generator_is_deterministic():
+    first = list(generate_students(100, seed=7, now=NOW))
+    second = list(generate_students(100, seed=7, now=NOW))
+    other_seed = list(generate_students(100, seed=8, now=NOW))
+    assert first == second
+    assert first != other_seed
+
+
+def test_default_timestamps_are_reproducible():
+    # No `now`: still identical across runs (and days), timestamps included
+    assert list(generate_students(50, seed=7)) == list(generate_students(50, seed=7))
+
+
+def test_slices_match_the_full_sequence():
+    # Mid-chunk and cross-chunk starts give the same rows as one long run
+    full = list(generate_students(CHUNK_SIZE + 50, now=NOW))
+    assert list(generate_students(30, start=CHUNK_SIZE - 10, now=NOW)) == full[CHUNK_SIZE - 10:CHUNK_SIZE + 20]
+
+
+def test_rows_are_valid_students():
+    rows = list(generate_students(2000, now=NOW))
+    assert len({r["email"] for r in rows}) == 2000
+    for row in rows:
+        assert 5 <= row["age"] <= 100
+        assert 1 <= len(row["grade"]) <= 20
+        assert 2 <= len(row["name"]) <= 100
+        assert not any(c.isdigit() for c in row["name"])
+        assert row["email"] == row["email"].lower()
+        assert row["created_at"] <= NOW
+    # Mostly school ages
+    assert sum(r["age"] < 18 for r in rows) / len(rows) > 0.8